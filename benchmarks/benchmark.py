@@ -0,0 +1,191 @@
+# Add the parent directory to the path so we can import the game module
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+
+# Importing game module
+from src.api import api
+from src.engine.game import Game
+from src.engine.instrumentation import Instrumentation
+from src.agents import RandomAgent
+
+
+# Importing other modules
+import argparse
+import json
+import random
+import time
+import numpy as np
+
+
+# Rosters of the full games, and number of games played for each of them
+GAME_SIZES = {8: 200, 24: 100, 100: 20, 1000: 1}
+
+# Seed of the first game of each benchmark
+SEED = 0
+
+
+def percentiles(durations: list[float]) -> dict[str, float]:
+    """
+    Returns the number of measures, and the mean and percentiles of durations
+    (in milliseconds).
+    """
+    durations = np.array(durations) * 1000
+    return {
+        "count": len(durations),
+        "mean_ms": float(durations.mean()),
+        "p50_ms": float(np.percentile(durations, 50)),
+        "p90_ms": float(np.percentile(durations, 90)),
+        "p99_ms": float(np.percentile(durations, 99)),
+        "max_ms": float(durations.max()),
+    }
+
+
+def benchmark_phases(number_of_tributes: int, games: int, headless: bool = True) -> dict[str, dict[str, float]]:
+    """
+    Play games with random agents (as `api` does) and time each call to
+    `get_state_of_game`, the decisions of the agents, and each call to
+    `update_game`, by phase ("first turn", "move" or "act").
+    """
+    durations = {"get_state_of_game": [], "decisions": [], "update_game (first turn)": [], "update_game (move)": [], "update_game (act)": []}
+    for i in range(games):
+        random.seed(SEED + i)
+        agents = [RandomAgent(str(j)) for j in range(number_of_tributes)]
+        game_ = Game(character_names=[agent.name for agent in agents], headless=headless)
+        game_.start_game()
+        while True:
+
+            # Get the state of the game
+            start = time.perf_counter()
+            state = game_.get_state_of_game()
+            durations["get_state_of_game"].append(time.perf_counter() - start)
+            alive_agents = [agent for agent in agents if state["characters"][agent.name]["state"]["alive"]]
+            if len(alive_agents) <= 1:
+                break
+
+            # Make the decisions
+            start = time.perf_counter()
+            for agent in alive_agents:
+                agent.give_state_of_game(state)
+            for agent, action in zip(alive_agents, RandomAgent.interrogate_batch(alive_agents)):
+                game_.set_action(agent.name, action)
+            durations["decisions"].append(time.perf_counter() - start)
+
+            # Update the game
+            phase = "first turn" if game_.day == 0 else game_.phase
+            start = time.perf_counter()
+            game_.update_game()
+            durations[f"update_game ({phase})"].append(time.perf_counter() - start)
+
+    return {name: percentiles(values) for name, values in durations.items()}
+
+
+def benchmark_save_message(headless: bool, calls: int = 100000) -> dict[str, float]:
+    """
+    Time calls to `save_message` with a template taken from the sentences,
+    sent to the debug channel and to a character.
+    """
+    random.seed(SEED)
+    game_ = Game(character_names=[str(i) for i in range(24)], headless=headless)
+    durations = []
+    for i in range(calls):
+        start = time.perf_counter()
+        game_.save_message(
+            "🔪💀 {attacker} slained {attacked}",
+            fmt={"attacker": "0", "attacked": "1"},
+            channel="debug" if i % 2 == 0 else "0",
+        )
+        durations.append(time.perf_counter() - start)
+    return percentiles(durations)
+
+
+def benchmark_map_draw(calls: int = 1000) -> dict[str, float]:
+    """
+    Time calls to `Map.draw`, with a growing set of discovered cells.
+    """
+    random.seed(SEED)
+    game_ = Game(character_names=[str(i) for i in range(24)])
+    positions = list(game_.map_.cells.keys())
+    durations = []
+    for i in range(calls):
+        discovered_cells = random.sample(positions, k=1 + i % len(positions))
+        start = time.perf_counter()
+        game_.map_.draw(discovered_cells=discovered_cells, current_position=discovered_cells[0])
+        durations.append(time.perf_counter() - start)
+    return percentiles(durations)
+
+
+def benchmark_games(
+    number_of_tributes: int,
+    games: int,
+    vectorized: bool = False,
+    instrumentation: Instrumentation | None = None,
+) -> dict[str, float]:
+    """
+    Play full games with `api` and random agents, and return the number of
+    games per second along with the durations of the games.
+    """
+    durations = []
+    for i in range(games):
+        random.seed(SEED + i)
+        agents = [RandomAgent(str(j)) for j in range(number_of_tributes)]
+        start = time.perf_counter()
+        api(agents, vectorized=vectorized, instrumentation=instrumentation)
+        durations.append(time.perf_counter() - start)
+    return {"games_per_second": len(durations) / sum(durations), **percentiles(durations)}
+
+
+def print_table(title: str, results: dict[str, dict[str, float]]) -> None:
+    """
+    Print the results of a group of benchmarks as a table.
+    """
+    columns = list(next(iter(results.values())).keys())
+    width = max(len(name) for name in results) + 2
+    print(f"\n{title}")
+    print(f"{'':<{width}}" + "".join(f"{column:>18}" for column in columns))
+    for name, values in results.items():
+        print(f"{name:<{width}}" + "".join(f"{values[column]:>18.3f}" if isinstance(values[column], float) else f"{values[column]:>18}" for column in columns))
+
+
+if __name__ == '__main__':
+
+    # Parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark the engine with fixed seeds.")
+    parser.add_argument("--quick", action="store_true", help="Play fewer games, and skip the games with 1,000 tributes.")
+    parser.add_argument("--vectorized", action="store_true", help="Use the vectorized resolution of the engine for full games.")
+    parser.add_argument("--instrument", action="store_true", help="Also report the time spent in each phase of the engine during the full games.")
+    parser.add_argument("--output", type=str, default=None, help="Save the results to this JSON file.")
+    args = parser.parse_args()
+    game_sizes = {n: max(1, games // 10) for n, games in GAME_SIZES.items() if n < 1000} if args.quick else GAME_SIZES
+
+    results = {}
+
+    # Phases of the game
+    results["phases (24 tributes, headless)"] = benchmark_phases(24, games=10 if args.quick else 100)
+    results["phases (24 tributes, logged)"] = benchmark_phases(24, games=10 if args.quick else 100, headless=False)
+    results["phases (100 tributes, headless)"] = benchmark_phases(100, games=2 if args.quick else 20)
+
+    # Messages and map
+    results["micro"] = {
+        "save_message (headless)": benchmark_save_message(headless=True, calls=10000 if args.quick else 100000),
+        "save_message (logged)": benchmark_save_message(headless=False, calls=10000 if args.quick else 100000),
+        "Map.draw": benchmark_map_draw(calls=100 if args.quick else 1000),
+    }
+
+    # Full games
+    instrumentations = {n: Instrumentation() if args.instrument else None for n in game_sizes}
+    results["games"] = {
+        f"api ({n} tributes)": benchmark_games(n, games, vectorized=args.vectorized, instrumentation=instrumentations[n])
+        for n, games in game_sizes.items()
+    }
+    if args.instrument:
+        for n, instrumentation in instrumentations.items():
+            results[f"engine phases (api, {n} tributes)"] = instrumentation.report()["phases"]
+
+    # Print and save
+    for title, group in results.items():
+        print_table(title, group)
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(results, f, indent=4)
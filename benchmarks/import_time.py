@@ -0,0 +1,85 @@
+# Importing modules
+import argparse
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+
+
+# Root of the repository, from which the modules are imported
+ROOT_DIRECTORY = os.path.join(os.path.dirname(__file__), "..")
+
+# Statements timed in fresh interpreters, as in the workers of a spawn-based
+# process pool
+STATEMENTS = {
+    "src.engine.game": "import src.engine.game",
+    "src.agents": "import src.agents",
+    "src.api": "import src.api",
+    "src.api + RandomAgent": "from src.api import api; from src.agents import RandomAgent",
+    "src.experiments": "import src.experiments",
+}
+
+# Dependencies that must not be imported by the statements above
+HEAVY_MODULES = ["pandas", "numpy", "openai", "pydantic"]
+
+# Code run in each interpreter: time the statement, and list the heavy modules
+# it imported
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+exec({statement!r})
+duration = time.perf_counter() - start
+print(json.dumps({{"duration": duration, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def benchmark_import(statement: str, runs: int) -> dict[str, float | list[str]]:
+    """
+    Run a statement in `runs` fresh interpreters, and return the percentiles
+    of its duration (in milliseconds), along with the heavy modules it
+    imported.
+    """
+    durations = []
+    heavy = set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            cwd=ROOT_DIRECTORY, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        durations.append(result["duration"])
+        heavy.update(result["heavy"])
+    durations = np.array(durations) * 1000
+    return {
+        "runs": runs,
+        "p50_ms": float(np.percentile(durations, 50)),
+        "max_ms": float(durations.max()),
+        "heavy_modules": sorted(heavy),
+    }
+
+
+if __name__ == '__main__':
+
+    # Parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark the time needed to import the game in a fresh interpreter.")
+    parser.add_argument("--runs", type=int, default=10, help="Number of interpreters started for each statement.")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if a statement imports a heavy module.")
+    parser.add_argument("--output", type=str, default=None, help="Save the results to this JSON file.")
+    args = parser.parse_args()
+
+    # Benchmark and print
+    results = {name: benchmark_import(statement, args.runs) for name, statement in STATEMENTS.items()}
+    width = max(len(name) for name in results) + 2
+    print(f"{'':<{width}}{'p50_ms':>12}{'max_ms':>12}  heavy_modules")
+    for name, result in results.items():
+        print(f"{name:<{width}}{result['p50_ms']:>12.1f}{result['max_ms']:>12.1f}  {', '.join(result['heavy_modules']) or '-'}")
+
+    # Save
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(results, f, indent=4)
+
+    # Check
+    if args.check and any(result["heavy_modules"] for result in results.values()):
+        sys.exit("Some statements import heavy modules, see the table above.")
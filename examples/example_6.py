@@ -0,0 +1,29 @@
+# Add the parent directory to the path so we can import the game module
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+
+# Importing game module
+from src.api import api
+from src.agents import MatrixAgent, RandomAgent
+from src.experiments import evolve
+
+
+if __name__ == '__main__':
+
+    # Evolve a population of matrix agents, saving checkpoints in `training`
+    # (running the script again resumes from the latest generation)
+    population, fitness = evolve(
+        population_size=96,
+        generations=20,
+        game_size=24,
+        checkpoint_dir="training",
+        seed=42,
+        verbose=True,
+    )
+
+    # Play the best matrix against random agents
+    best = MatrixAgent.from_population(population, names=["Best"], indices=[int(fitness.argmax())])
+    agents = best + [RandomAgent(name=str(i)) for i in range(23)]
+    api(agents=agents, verbose=True)
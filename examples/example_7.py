@@ -0,0 +1,73 @@
+# Add the parent directory to the path so we can import the game module
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+
+# Importing game module
+from src.engine.game import Game
+from src.agents import PersonalityAgent
+from src.shared.shm import SharedStateWriter, SharedStateReader
+from src.shared import utils
+
+
+# Importing other modules
+import random
+from multiprocessing import Pool
+
+
+# Number of worker processes making the decisions
+WORKERS = 4
+
+# State of each worker process: its reader of the shared state, and the
+# agents it has played so far
+WORKER = {}
+
+
+def init_worker(block_name: str, character_names: list[str], game_id: str) -> None:
+    WORKER["reader"] = SharedStateReader(block_name, character_names, game_id)
+    WORKER["agents"] = {}
+
+
+def decide(notification: dict, names: list[str]) -> dict[str, str]:
+    """
+    Make the decisions of some characters, from the state published in the
+    shared memory block (only the small notification travels through the
+    pool). The personality of each character is drawn from their name, so
+    that any worker can play any character.
+    """
+    reader = WORKER["reader"]
+    actions = {}
+    for name in names:
+        if name not in WORKER["agents"]:
+            rng = random.Random(name)
+            WORKER["agents"][name] = PersonalityAgent(name, resilience=rng.random(), hostility=rng.random(), impulsivity=rng.random())
+        agent = WORKER["agents"][name]
+        agent.give_state_of_game(reader.get_state(name))
+        actions[name] = agent.interrogate()
+    return actions
+
+
+if __name__ == '__main__':
+
+    # Create the game
+    names = [f"Tribute {i}" for i in range(24)]
+    game_ = Game(character_names=names, headless=True)
+    game_.start_game()
+
+    # Publish each state in shared memory, and let the workers decide
+    with SharedStateWriter(names) as writer, Pool(WORKERS, initializer=init_worker, initargs=(writer.name, names, game_.id)) as pool:
+        while True:
+            state = game_.get_state_of_game()
+            notification = writer.publish(state)
+            alive_characters = state["game"]["state"]["alive_characters"]
+            if len(alive_characters) <= 1:
+                break
+            chunks = [alive_characters[i::WORKERS] for i in range(WORKERS)]
+            for actions in pool.starmap(decide, [(notification, chunk) for chunk in chunks]):
+                for name, action in actions.items():
+                    game_.set_action(name, action)
+            game_.update_game()
+
+    # Print the winner
+    print("Game over! Winner is " + utils.smart_join(lst=[c.name for c in game_.get_alive_characters()], sep=", ", last_sep=" and ") + "!")
@@ -1,10 +1,20 @@
+import importlib
 from .base import BaseAgent
 from .cmd import CMDAgent
 from .random import RandomAgent
 from .personality import PersonalityAgent
 from .transition import TransitionAgent
-from .matrix import MatrixAgent
-from .llm import LLMAgent
+
+# Agents with heavy dependencies (NumPy, OpenAI), imported on first access
+LAZY_AGENTS = {
+    "MatrixAgent": ".matrix",
+    "LLMAgent": ".llm",
+}
+
+def __getattr__(name: str):
+    if name in LAZY_AGENTS:
+        return getattr(importlib.import_module(LAZY_AGENTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "BaseAgent",
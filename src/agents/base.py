@@ -1,17 +1,38 @@
 from typing import List
+from ..shared.delta import StateView
 
 
 class BaseAgent:
 
+    # If True, the agent only receives what changed since its last
+    # observation (see `shared.delta`) instead of the full state of the game
+    delta_state: bool = False
+
     def __init__(self, name: str):
         self.name = name
         self.current_state = None
+        self.state_view = None
 
 
     def __repr__(self):
         return f"{self.__class__.__name__}(name={self.name})"
 
 
+    def get_config(self) -> dict:
+        """
+        Returns a JSON-serializable description of the agent, i.e. its class
+        and the parameters that define its behaviour (by default, all its
+        attributes that are numbers, strings or booleans), used to identify
+        games played with the same agents.
+        """
+        config = {"class": f"{self.__class__.__module__}.{self.__class__.__qualname__}"}
+        for key, value in vars(self).items():
+            if isinstance(value, (int, float, str, bool)) or value is None:
+                if key not in ["current_state", "state_view"]:
+                    config[key] = value
+        return config
+
+
     def messages2str(self, messages: List[str]) -> str:
         """
         Returns a string representation of a list of messages.
@@ -37,12 +58,19 @@ class BaseAgent:
 
 
 
-    def give_state_of_game(self, game_state: str) -> None:
+    def give_state_of_game(self, game_state: dict) -> None:
         """
         Sends the current state of the game to the LLM, which will later be
-        used to make a decision.
+        used to make a decision. If the agent receives deltas (see
+        `delta_state`), they are applied to a `StateView` so that
+        `current_state` still holds the full view of the character.
         """
-        self.current_state = game_state
+        if self.delta_state:
+            if self.state_view is None:
+                self.state_view = StateView(self.name)
+            self.current_state = self.state_view.update(game_state)
+        else:
+            self.current_state = game_state
 
 
     def interrogate(self) -> str:
@@ -53,6 +81,33 @@ class BaseAgent:
         raise NotImplementedError("The method `interrogate` must be implemented by the child class.")
 
 
+    @classmethod
+    def interrogate_batch(cls, agents: list["BaseAgent"]) -> list[str]:
+        """
+        Ask many agents of this class to chose an action at once, each based on
+        the state of the game given to it by the `give_state_of_game` method.
+        Returns the actions in the same order as `agents`. By default, each
+        agent is simply interrogated in turn, but child classes can override
+        this method to make all the decisions at once.
+        """
+        return [agent.interrogate() for agent in agents]
+
+
+    @classmethod
+    def is_vectorized(cls) -> bool:
+        """
+        Whether `interrogate_batch` makes the decisions of the agents of this
+        class all at once, i.e. whether it is overridden by a class whose
+        `interrogate` is also the one of this class. Child classes with their
+        own `interrogate` are asked one by one by the `interrogate_batch` they
+        inherit.
+        """
+        for parent in cls.__mro__:
+            if "interrogate_batch" in vars(parent):
+                return parent is not BaseAgent and cls.interrogate is parent.interrogate
+        return False
+
+
     def inform_death(self) -> None:
         """
         Inform the agent that the character has died.
@@ -60,6 +115,14 @@ class BaseAgent:
         pass
 
 
+    def inform_end_of_game(self) -> None:
+        """
+        Inform the agent that the game has ended, e.g. to release what it kept
+        open during the game.
+        """
+        pass
+
+
     def is_alive(self) -> bool:
         """
         Simple method to check if the character is alive.
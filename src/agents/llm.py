@@ -1,23 +1,14 @@
 import os
 import json
-import yaml
+import hashlib
+import tempfile
+from typing import Literal
+from collections import Counter
 from openai import OpenAI
 from pydantic import BaseModel, Field
 from enum import Enum
 from .base import BaseAgent
-from ..shared import utils
-
-
-# Custom YAML dumper to handle multiline strings
-class LiteralDumper(yaml.SafeDumper):
-    pass
-def str_presenter(dumper, data):
-    data = utils.wrap_text(data, width=80)
-    if '\n' in data:
-        data = utils.replace_all(data, ' \n', '\n')
-        return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-    return dumper.represent_scalar('tag:yaml.org,2002:str', data)
-LiteralDumper.add_representer(str, str_presenter)
+from ..shared.logs import EXTENSIONS, get_compression, open_log
 
 
 class Action(str, Enum):
@@ -43,6 +34,153 @@ class Response(BaseModel):
     action: Action = Field(description="The action being taken.")
 
 
+class ResponseCache:
+    """
+    Persistent cache of the responses of the model on disk, so that identical
+    requests (e.g. when replaying a game with the same seed) are answered
+    locally. A request is identified by a hash of the model, the conversation
+    and the response schema, and each response is stored in its own file,
+    written atomically, so that many processes can share the same cache.
+
+    When `max_entries` or `max_bytes` is given, the least recently used
+    responses are evicted to stay within the limits. In "read-only" mode,
+    cached responses are used but nothing is ever written to the cache.
+    """
+
+    def __init__(
+        self,
+        directory: str = "cache_llm",
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        mode: Literal["read-write", "read-only"] = "read-write",
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.__usage: tuple[int, int] | None = None
+
+
+    @staticmethod
+    def key(model: str, messages: list[dict[str, str]], response_format: type[BaseModel]) -> str:
+        """
+        Returns the key of a request.
+        """
+        description = {
+            "model": model,
+            "messages": messages,
+            "response_format": response_format.model_json_schema(),
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+
+    def get(self, key: str) -> str | None:
+        """
+        Returns the response stored for a key, or None if there is none. The
+        response is marked as recently used.
+        """
+        path = self.__path(key)
+        try:
+            with open(path, "r", encoding="utf8") as f:
+                content = json.load(f)["content"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+        if self.mode == "read-write":
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+        return content
+
+
+    def put(self, key: str, content: str) -> None:
+        """
+        Store the response to a request, and evict the least recently used
+        responses if the cache is over its limits.
+        """
+        if self.mode == "read-only":
+            return
+        path = self.__path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            previous_size = os.path.getsize(path)
+        except FileNotFoundError:
+            previous_size = None
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf8") as f:
+                json.dump({"content": content}, f, ensure_ascii=False)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        # Keep track of the usage (a response written over a cached one only
+        # changes the size), and only scan the cache when it may be over its
+        # limits
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        if self.__usage is None:
+            self.__usage = self.__scan_usage()
+        elif previous_size is None:
+            self.__usage = (self.__usage[0] + 1, self.__usage[1] + os.path.getsize(path))
+        else:
+            self.__usage = (self.__usage[0], self.__usage[1] + os.path.getsize(path) - previous_size)
+        if self.__over_limits(*self.__usage, slack=1.0):
+            self.evict()
+
+
+    def __entries(self) -> list[tuple[float, int, str]]:
+        """
+        Returns the last use time, size and path of all the cached responses.
+        """
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                if file.endswith(".json"):
+                    path = os.path.join(root, file)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+
+    def __scan_usage(self) -> tuple[int, int]:
+        entries = self.__entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+
+    def __over_limits(self, entries: int, size: int, slack: float) -> bool:
+        return (
+            (self.max_entries is not None and entries > slack * self.max_entries)
+            or (self.max_bytes is not None and size > slack * self.max_bytes)
+        )
+
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used responses until the cache is back to
+        90% of its limits, so that evictions are not needed at every write.
+        """
+        entries = sorted(self.__entries())
+        count, size = len(entries), sum(size for _, size, _ in entries)
+        for _, entry_size, path in entries:
+            if not self.__over_limits(count, size, slack=0.9):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            count, size = count - 1, size - entry_size
+        self.__usage = (count, size)
+
+
 class LLMAgent(BaseAgent):
 
     def __init__(
@@ -51,6 +189,12 @@ class LLMAgent(BaseAgent):
         api_key: str,
         system_prompt: str,
         verbose: bool,
+        model: str = "gpt-4o-mini",
+        cache: ResponseCache | None = None,
+        context: Literal["full", "window", "summary"] = "full",
+        window: int = 4,
+        vitals: bool = False,
+        compression: Literal["gzip", "zstd"] | None = None,
     ):
 
         # Initialize the parent class
@@ -68,8 +212,102 @@ class LLMAgent(BaseAgent):
         # Create the parsed response history
         self.parsed_response_history = []
 
-        # Set verbosity
+        # Set verbosity, and the compression of the transcript, which is kept
+        # open during a game (see `__log`)
         self.verbose = verbose
+        self.compression = compression
+        self.transcript = None
+        self.transcript_path = None
+
+        # Set the model, and the cache of its responses
+        self.model = model
+        self.cache = cache
+
+        # Set the context strategy: send the "full" discussion, only the last
+        # `window` turns, or the last turns along with a "summary" of the
+        # older ones, and optionally a header with the current vitals
+        self.context = context
+        self.window = window
+        self.vitals = vitals
+
+
+    def get_config(self) -> dict:
+        config = super().get_config()
+        config.pop("verbose", None)
+        config.pop("compression", None)
+        config.pop("transcript", None)
+        config.pop("transcript_path", None)
+        config["system_prompt"] = self.discussion[0]["content"]
+        return config
+
+
+    def __vitals_header(self) -> str:
+        """
+        Returns a short description of the current state of the character.
+        """
+        game_state = self.current_state["game"]["state"]
+        state = self.current_state["characters"][self.name]["state"]
+        return "\n".join([
+            f"[Day {game_state['day']} ({game_state['time']}), {game_state['phase']} phase, {len(game_state['alive_characters'])} tributes alive]",
+            f"[Health {state['health']}, energy {state['energy']}, mental {state['mental']}, hunger {state['hunger']}, thirst {state['thirst']}]",
+            f"[Bag: {state['bag_food']} food, {state['bag_water']} water, best weapon: {state['bag_best_weapon_name']} ({state['bag_best_weapon_damage']} damage), kills: {state['stats_kills']}]",
+        ])
+
+
+    def __summary_message(self, turns: int) -> dict[str, str]:
+        """
+        Returns a compact summary of the first turns of the discussion, i.e.
+        the number of times each action was chosen.
+        """
+        counts = Counter(parsed.action.value for parsed in self.parsed_response_history[:turns])
+        actions = ", ".join(f"{action} x{count}" for action, count in counts.most_common())
+        return {
+            "role": "system",
+            "content": f"Summary of your {turns} previous turns, no longer shown. Actions chosen: {actions}.",
+        }
+
+
+    def __build_conversation(self, payload: dict[str, str]) -> list[dict[str, str]]:
+        """
+        Returns the conversation to send to the model, according to the
+        context strategy. With a "window" or a "summary", the length of the
+        conversation does not grow with the length of the game.
+        """
+        if self.context == "full":
+            return self.discussion + [payload]
+        recent = self.discussion[1:][-2 * self.window:] if self.window > 0 else []
+        older_turns = len(self.parsed_response_history) - len(recent) // 2
+        if self.context == "summary" and older_turns > 0:
+            return [self.discussion[0], self.__summary_message(older_turns)] + recent + [payload]
+        return [self.discussion[0]] + recent + [payload]
+
+
+    def __log(self, entries: list[dict[str, str]]) -> None:
+        """
+        Append entries to the transcript of the agent for the current game, a
+        JSON Lines file starting with the system prompt, so that each call only
+        writes what is new (see `shared.logs.read_jsonl_log` to read it back).
+        The file is opened once per game, and closed when the character dies
+        or the game ends. Uncompressed transcripts are flushed after each call,
+        so that they can be followed as the game goes.
+        """
+        path = os.path.join("logs", f"log_{self.current_state['game']['id']}_{self.name}.jsonl" + EXTENSIONS[self.compression])
+        if path != self.transcript_path:
+            self.__close_transcript()
+            if not os.path.exists(path):
+                entries = [self.discussion[0]] + entries
+            self.transcript = open_log(path, "a")
+            self.transcript_path = path
+        self.transcript.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        if get_compression(path) is None:
+            self.transcript.flush()
+
+
+    def __close_transcript(self) -> None:
+        if self.transcript is not None:
+            self.transcript.close()
+            self.transcript = None
+            self.transcript_path = None
 
 
     def interrogate(self) -> str:
@@ -87,55 +325,46 @@ class LLMAgent(BaseAgent):
             super().messages2str(self.current_state["characters"][self.name]["messages"]),
             # str2border("Private POV (end)"),
         ])
+        if self.vitals:
+            new_user_message = self.__vitals_header() + "\n\n" + new_user_message
 
         payload_to_send = {
             "role": "user",
             "content": new_user_message
         }
-        whole_conversation = self.discussion + [payload_to_send]
-
-        # Send the current state to the model
-        response = self.client.beta.chat.completions.parse(
-            model="gpt-4o-mini",
-            messages=whole_conversation,
-            response_format=Response,
-        )
+        whole_conversation = self.__build_conversation(payload_to_send)
+
+        # Send the current state to the model, unless the response is cached
+        key = self.cache.key(self.model, whole_conversation, Response) if self.cache is not None else None
+        content = self.cache.get(key) if key is not None else None
+        if content is None:
+            response = self.client.beta.chat.completions.parse(
+                model=self.model,
+                messages=whole_conversation,
+                response_format=Response,
+            )
+            content = response.choices[0].message.content
+            if key is not None:
+                self.cache.put(key, content)
+        parsed = Response.model_validate_json(content)
 
         # Update the history
         self.discussion.append(payload_to_send)
         self.discussion.append({
             "role": "assistant",
-            "content": response.choices[0].message.content
+            "content": content
         })
-        self.parsed_response_history.append(response.choices[0].message.parsed)
+        self.parsed_response_history.append(parsed)
 
-        # Format everything and write it to a file
+        # Append the new exchange to the transcript
         if self.verbose:
-
-            # Prepare data
-            data = {
-                "system_prompt": self.discussion[0]["content"],
-                "discussion": [],
-            }
-
-            for i, d in enumerate(self.discussion):
-                role = d["role"]
-                if role == "user":
-                    content = d["content"]
-                    data["discussion"].append({"role": role, "content": content})
-                elif role == "assistant":
-                    parsed = self.parsed_response_history[(i - 1) // 2]  # TODO: make this more robust
-                    data["discussion"].append({"role": role} | json.loads(parsed.json()))
-
-            # Write to file
-            os.makedirs("logs", exist_ok=True)
-            # with open(os.path.join("logs", f"log_{self.current_state['game']['id']}_{self.name}.json"), "w", encoding="utf8") as f:
-            #     json.dump(data, f, indent=4, ensure_ascii=False)
-            with open(os.path.join("logs", f"log_{self.current_state['game']['id']}_{self.name}.yaml"), "w", encoding="utf8") as f:
-                yaml.dump(data, Dumper=LiteralDumper, default_flow_style=False, allow_unicode=True, stream=f, sort_keys=False)
+            self.__log([
+                payload_to_send,
+                {"role": "assistant"} | parsed.model_dump(mode="json"),
+            ])
 
         # Return
-        return response.choices[0].message.parsed.action
+        return parsed.action
 
 
     def inform_death(self) -> None:
@@ -160,27 +389,11 @@ class LLMAgent(BaseAgent):
         # Update the history (only the user message)
         self.discussion.append(death_payload)
 
-        # Format everything and write it to a file
+        # Append the message to the transcript, which is then complete
         if self.verbose:
+            self.__log([death_payload])
+        self.__close_transcript()
+
 
-            # Prepare data
-            data = {
-                "system_prompt": self.discussion[0]["content"],
-                "discussion": [],
-            }
-
-            for i, d in enumerate(self.discussion):
-                role = d["role"]
-                if role == "user":
-                    content = d["content"]
-                    data["discussion"].append({"role": role, "content": content})
-                elif role == "assistant":
-                    parsed = self.parsed_response_history[(i - 1) // 2]  # TODO: make this more robust
-                    data["discussion"].append({"role": role} | json.loads(parsed.json()))
-
-            # Write to file
-            os.makedirs("logs", exist_ok=True)
-            # with open(os.path.join("logs", f"log_{self.current_state['game']['id']}_{self.name}.json"), "w", encoding="utf8") as f:
-            #     json.dump(data, f, indent=4, ensure_ascii=False)
-            with open(os.path.join("logs", f"log_{self.current_state['game']['id']}_{self.name}.yaml"), "w", encoding="utf8") as f:
-                yaml.dump(data, Dumper=LiteralDumper, default_flow_style=False, allow_unicode=True, stream=f, sort_keys=False)
+    def inform_end_of_game(self) -> None:
+        self.__close_transcript()
@@ -12,6 +12,8 @@ class MatrixAgent(BaseAgent):
         self,
         name: str,
         matrix: np.ndarray | None = None,
+        population: np.ndarray | None = None,
+        population_index: int | None = None,
     ):
 
         # Initialize the parent class
@@ -32,16 +34,57 @@ class MatrixAgent(BaseAgent):
             "hide",
         ]
 
-        # If matrix is provided, check its dimensions
+        # If the agent is part of a population, its matrix is a view of the
+        # population's weights
         height = len(self.actions)
         width = 5
-        if matrix:
+        if population is not None:
+            if population.ndim != 3 or population.shape[1:] != (height, width):
+                raise ValueError(f"Population should have shape (P, {height}, {width})")
+            matrix = population[population_index]
+        self.population = population
+        self.population_index = population_index
+
+        # If matrix is provided, check its dimensions
+        if matrix is not None:
             if matrix.shape != (height, width):
                 raise ValueError(f"Matrix should have shape ({height}, {width})")
 
         # If no matrix is provided, use a random one
         if matrix is None:
             matrix = np.random.rand(height, width)
+        self.matrix = matrix
+
+
+    def get_config(self) -> dict:
+        config = super().get_config()
+        config.pop("population_index", None)
+        config["matrix"] = np.asarray(self.matrix).tolist()
+        return config
+
+
+    @classmethod
+    def from_population(
+        cls,
+        population: np.ndarray | str,
+        names: list[str] | None = None,
+        indices: list[int] | None = None,
+    ) -> list["MatrixAgent"]:
+        """
+        Create agents from a population of matrices, i.e. an array of shape
+        `(P, 11, 5)` or the path to a `.npy` file holding it (memory-mapped,
+        so that only the matrices of the agents are read). By default, one
+        agent is created for each matrix of the population. The agents share
+        the population's weights, so that their decisions can be computed all
+        at once by `interrogate_batch`.
+        """
+        if isinstance(population, str):
+            population = np.load(population, mmap_mode="r")
+        if indices is None:
+            indices = list(range(len(population)))
+        if names is None:
+            names = [f"Matrix {index}" for index in indices]
+        return [cls(name, population=population, population_index=index) for name, index in zip(names, indices)]
 
 
     def __get_directions(
@@ -132,5 +175,56 @@ class MatrixAgent(BaseAgent):
         # Get the best action
         allowed_actions_indices = [self.actions.index(action) for action in allowed_actions]
         best_action_index = np.argmax(output_vector[allowed_actions_indices])
-        best_action = self.actions[best_action_index]
+        best_action = allowed_actions[best_action_index]
         return best_action
+
+
+    @classmethod
+    def interrogate_batch(cls, agents: list["MatrixAgent"]) -> list[str]:
+        """
+        Vectorized version of `interrogate`, computing the decisions of many
+        agents of the same game with a single `einsum`. If all the agents come
+        from the same population, their matrices are taken from it at once.
+        """
+        # Child classes with their own way of deciding are asked one by one
+        if not cls.is_vectorized():
+            return super().interrogate_batch(agents)
+
+        # Easy access to some quantities
+        day = agents[0].current_state["game"]["state"]["day"]
+        time = agents[0].current_state["game"]["state"]["time"]
+        phase = agents[0].current_state["game"]["state"]["phase"]
+        actions = agents[0].actions
+
+        # Compute the input vectors
+        states = [agent.current_state["characters"][agent.name]["state"] for agent in agents]
+        needs_food_coef = utils.map_range(np.array([state["hunger"] for state in states]), 0, constants.MAX_HUNGER, 1, 0)
+        needs_water_coef = utils.map_range(np.array([state["thirst"] for state in states]), 0, constants.MAX_THIRST, 1, 0)
+        input_vectors = np.column_stack([
+            needs_food_coef,
+            needs_water_coef,
+            np.maximum(needs_food_coef, needs_water_coef),
+            np.full(len(agents), 1 if time == "night" else 0),
+            np.array([1 if state["bag_weapons_count"] > 0 else 0 for state in states]),
+        ])
+
+        # Get the matrices
+        population = agents[0].population
+        if population is not None and all(agent.population is population for agent in agents):
+            matrices = population[[agent.population_index for agent in agents]]
+        else:
+            matrices = np.stack([agent.matrix for agent in agents])
+
+        if day == 0:
+            allowed_actions: list = ["run towards", "run away"]
+        elif phase == "move":
+            allowed_actions: list = ["go north", "go south", "go east", "go west", "stay"]
+        elif phase == "act":
+            allowed_actions: list = ["hunt", "gather", "rest", "hide"]
+
+        # Compute the output vectors, only for the allowed actions
+        allowed_actions_indices = [actions.index(action) for action in allowed_actions]
+        output_vectors = np.einsum("nij,nj->ni", matrices[:, allowed_actions_indices], input_vectors)
+
+        # Get the best actions
+        return [allowed_actions[index] for index in np.argmax(output_vectors, axis=1).tolist()]
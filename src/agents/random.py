@@ -1,7 +1,7 @@
 import random
 from .base import BaseAgent
 from ..engine import constants
-from ..shared.utils import random_bool
+from ..shared.utils import random_bool, numpy_rng
 
 
 class RandomAgent(BaseAgent):
@@ -48,3 +48,48 @@ class RandomAgent(BaseAgent):
 
         # Default behaviour if everything is fine
         return random.choice(["hunt", "hide", "gather"])
+
+
+    @classmethod
+    def interrogate_batch(cls, agents: list["RandomAgent"]) -> list[str]:
+        """
+        Vectorized version of `interrogate`, making the decisions of many
+        agents of the same game at once (with the same probabilities).
+        """
+        # Child classes with their own way of deciding are asked one by one
+        if not cls.is_vectorized():
+            return super().interrogate_batch(agents)
+        import numpy as np  # only for the batched decisions
+        rng = numpy_rng()
+        n = len(agents)
+        game_state = agents[0].current_state["game"]["state"]
+
+        # Chose first round's action
+        if game_state["day"] == 0:
+            return np.array(["run towards", "run away"])[rng.integers(2, size=n)].tolist()
+
+        # Chose movement if phase is "move"
+        if game_state["phase"] == "move":
+            actions = np.array(["go north", "go south", "go east", "go west"])[rng.integers(4, size=n)].astype("<U8")
+            actions[rng.random(n) >= 0.5] = "stay"
+            return actions.tolist()
+
+        # Get the states of the characters
+        states = [agent.current_state["characters"][agent.name]["state"] for agent in agents]
+        hunger = np.array([state["hunger"] for state in states])
+        thirst = np.array([state["thirst"] for state in states])
+        energy = np.array([state["energy"] for state in states])
+        spotted = np.array([bool(state["current_spotted_characters"]) for state in states], dtype=bool)
+
+        # Critical behaviours if hungry, thirsty or sleepy
+        gather = (rng.random(n) < 1 - ((hunger - 1) // constants.MAX_HUNGER)) | (rng.random(n) < 1 - ((thirst - 1) // constants.MAX_THIRST))
+        rest = (game_state["time"] == "night") & (rng.random(n) < 1 - ((energy - 1) // constants.MAX_ENERGY))
+
+        # Hunt or hide if at least one opponent spotted, default behaviour
+        # otherwise
+        default = np.where(
+            spotted,
+            np.array(["hunt", "hide"])[rng.integers(2, size=n)],
+            np.array(["hunt", "hide", "gather"])[rng.integers(3, size=n)],
+        )
+        return np.where(gather, "gather", np.where(rest, "rest", default)).tolist()
@@ -1,5 +1,5 @@
 import random
-from typing import Literal
+from typing import Any, Literal
 from .base import BaseAgent
 from ..engine import constants
 from ..shared import utils
@@ -90,47 +90,105 @@ class TransitionAgent(BaseAgent):
         )
 
 
+    def __coefficients(self) -> tuple[float, int]:
+        """
+        Returns the coefficients of the state of the agent used by its weights,
+        i.e. how much it needs resources and whether it has a weapon.
+        """
+        state = self.current_state["characters"][self.name]["state"]
+        needs_food_coef = utils.map_range(state["hunger"], 0, constants.MAX_HUNGER, 1, 0)
+        needs_water_coef = utils.map_range(state["thirst"], 0, constants.MAX_THIRST, 1, 0)
+        needs_resources_coef = max(needs_food_coef, needs_water_coef)
+        has_weapon_coef = 1 if state["bag_weapons_count"] > 0 else 0
+        return needs_resources_coef, has_weapon_coef
+
+
+    def __weights(self, day: int, time: str, phase: str, resilience, hostility, needs_resources_coef, has_weapon_coef) -> dict[str, Any]:
+        """
+        Returns the weight of each option of `interrogate` ("towards" and "away"
+        standing for the directions of the move phase), for one agent (floats)
+        or for many agents at once (NumPy arrays).
+        """
+        is_night_coef = 1 if time == "night" else 0
+        if day == 0:
+            return {
+                "run towards": self.__aggregate_factors([hostility, resilience], []),
+                "run away": self.__aggregate_factors([resilience], [hostility]),
+            }
+        elif phase == "move":
+            return {
+                "towards": self.__aggregate_factors([hostility, resilience, needs_resources_coef], [has_weapon_coef]),
+                "away": self.__aggregate_factors([resilience, has_weapon_coef, needs_resources_coef], [hostility]),
+            }
+        elif phase == "act":
+            return {
+                "hunt": self.__aggregate_factors([hostility, has_weapon_coef], [needs_resources_coef]),
+                "gather": self.__aggregate_factors([resilience, needs_resources_coef], [is_night_coef]),
+                "rest": self.__aggregate_factors([is_night_coef], []) * 0.5,
+                "hide": self.__aggregate_factors([resilience], [has_weapon_coef, hostility]) * 0.5,
+            }
+        return {}
+
+
     def interrogate(self) -> str:
 
         # Easy access to the personality values
-        resilience = self.resilience()
-        hostility = self.hostility()
         day = self.current_state["game"]["state"]["day"]
+        resilience = self.resilience(day)
+        hostility = self.hostility(day)
         time = self.current_state["game"]["state"]["time"]
         phase = self.current_state["game"]["state"]["phase"]
+        weights = self.__weights(day, time, phase, resilience, hostility, *self.__coefficients())
 
-        # Compute some useful coefficients
-        needs_food_coef = utils.map_range(self.current_state["characters"][self.name]["state"]["hunger"], 0, constants.MAX_HUNGER, 1, 0)
-        needs_water_coef = utils.map_range(self.current_state["characters"][self.name]["state"]["thirst"], 0, constants.MAX_THIRST, 1, 0)
-        needs_resources_coef = max(needs_food_coef, needs_water_coef)
-        is_night_coef = 1 if time == "night" else 0
-        has_weapon_coef = 1 if self.current_state["characters"][self.name]["state"]["bag_weapons_count"] > 0 else 0
-
-        if day == 0:
-            run_towards_weight = self.__aggregate_factors([hostility, resilience], [])
-            run_away_weight = self.__aggregate_factors([resilience], [hostility])
-            return random.choices(
-                ["run towards", "run away"],
-                weights=[run_towards_weight, run_away_weight],
-            )[0]
-
-        elif phase == "move":
-            move_towards_weight = self.__aggregate_factors([hostility, resilience, needs_resources_coef], [has_weapon_coef])
-            move_away_weight = self.__aggregate_factors([resilience, has_weapon_coef, needs_resources_coef], [hostility])
+        if phase == "move" and day != 0:
             return random.choices(
                 [
                     random.choice(self.__get_directions("towards")),
                     random.choice(self.__get_directions("away")),
                 ],
-                weights=[move_towards_weight, move_away_weight],
+                weights=[weights["towards"], weights["away"]],
             )[0]
+        elif weights:
+            return random.choices(list(weights), weights=list(weights.values()))[0]
 
-        elif phase == "act":
-            hunt_weight = self.__aggregate_factors([hostility, has_weapon_coef], [needs_resources_coef])
-            gather_weight = self.__aggregate_factors([resilience, needs_resources_coef], [is_night_coef])
-            rest_weight = self.__aggregate_factors([is_night_coef], []) * 0.5
-            hide_weight = self.__aggregate_factors([resilience], [has_weapon_coef, hostility]) * 0.5
-            return random.choices(
-                ["hunt", "gather", "rest", "hide"],
-                weights=[hunt_weight, gather_weight, rest_weight, hide_weight],
-            )[0]
+
+    @classmethod
+    def interrogate_batch(cls, agents: list["TransitionAgent"]) -> list[str]:
+        """
+        Vectorized version of `interrogate`, making the decisions of many
+        agents of the same game at once (with the same probabilities).
+        """
+        # Child classes with their own way of deciding are asked one by one
+        if not cls.is_vectorized():
+            return super().interrogate_batch(agents)
+        import numpy as np  # only for the batched decisions
+        rng = utils.numpy_rng()
+        n = len(agents)
+
+        # Easy access to the personality values
+        day = agents[0].current_state["game"]["state"]["day"]
+        time = agents[0].current_state["game"]["state"]["time"]
+        phase = agents[0].current_state["game"]["state"]["phase"]
+        resilience = np.array([agent.resilience(day) for agent in agents])
+        hostility = np.array([agent.hostility(day) for agent in agents])
+        needs_resources_coef, has_weapon_coef = np.array([agent.__coefficients() for agent in agents]).T
+        weights = agents[0].__weights(day, time, phase, resilience, hostility, needs_resources_coef, has_weapon_coef)
+
+        # Draw the directions of the move phase, then all the actions at once
+        if phase == "move" and day != 0:
+            draws = rng.random((n, 2))
+            options = np.array([
+                [
+                    towards[int(u * len(towards))],
+                    away[int(v * len(away))],
+                ]
+                for towards, away, (u, v) in zip(
+                    (agent.__get_directions("towards") for agent in agents),
+                    (agent.__get_directions("away") for agent in agents),
+                    draws.tolist(),
+                )
+            ])
+        else:
+            options = np.array([list(weights)] * n)
+        weights = np.column_stack([np.broadcast_to(weight, n) for weight in weights.values()])
+        return options[np.arange(n), utils.weighted_choice_indices(weights, rng)].tolist()
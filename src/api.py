@@ -1,10 +1,19 @@
 import copy
 import os
-from typing import TypeVar, Any
-import pandas as pd  # only for logging
+import random
+import time
+import contextlib
+import threading
+from typing import TYPE_CHECKING, TypeVar, Any, Callable, Literal
 from .engine import game
+from .engine.instrumentation import Instrumentation
 from .shared import utils
-from .agents import BaseAgent
+from .shared import delta
+from .shared.latency import DecisionLatencies
+from .shared.logs import EXTENSIONS, TextLogWriter, open_log
+from .agents import BaseAgent, RandomAgent
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # Define the type of the agent
@@ -37,25 +46,11 @@ def __str2border(s: str, total_length: int = 80) -> str:
     return f"{s:-<{total_length-1}}"
 
 
-def __save_txt(game_, state_history) -> None:
-    """
-    Save the game log to a text file.
-    """
-    os.makedirs("logs", exist_ok=True)
-    debug_messages = []
-    for state in state_history:
-        debug_messages.append(__messages2str(state["debug"]["messages"]))
-        debug_messages.append("")
-    with open(os.path.join("logs", f"log_{game_.id}.txt"), "w", encoding="utf8") as f:
-        f.write(__messages2str(debug_messages) + "\n")
-
-
-def __save_tsv(game_, state_history) -> None:
+def __save_tsv(game_, state_history, compression: Literal["gzip", "zstd"] | None = None) -> None:
     """
     Save the full state history to a TSV file. Each row corresponds to a given
     point in time in the game, times the number of characters in the game.
     """
-    os.makedirs("logs", exist_ok=True)
     data = {}
     for state in state_history:
         game_state = state["game"]
@@ -87,35 +82,88 @@ def __save_tsv(game_, state_history) -> None:
             else:
                 for key in combined_state.keys():
                     data[key].append(combined_state[key])
+    import pandas as pd  # only for logging
     df = pd.DataFrame(data)
-    df.to_csv(os.path.join("logs", f"log_{game_.id}.tsv"), sep="\t", index=False, encoding="utf8")
+    with open_log(os.path.join("logs", f"log_{game_.id}.tsv" + EXTENSIONS[compression]), "w") as f:
+        df.to_csv(f, sep="\t", index=False)
+
+
+def __decide(
+    decision: Callable[[], Any],
+    timeout: float | None = None,
+    protect: bool = False,
+) -> tuple[Any, str | None, float | None, threading.Thread | None]:
+    """
+    Make a decision and return its result, the reason of its failure (None if
+    it succeeded), the CPU time it took in the thread that made it (None if
+    unknown), and the thread still running it if it timed out (else None).
+
+    If `protect` is set, a decision that raises an exception fails with
+    "error" instead of raising it. If `timeout` is given, the decision is made
+    in a separate thread, and fails with "timeout" if it did not return
+    within `timeout` seconds: it is then left running in the background, and
+    its result is ignored.
+    """
+    if timeout is None:
+        cpu_start = time.thread_time()
+        try:
+            return decision(), None, time.thread_time() - cpu_start, None
+        except Exception:
+            if not protect:
+                raise
+            return None, "error", time.thread_time() - cpu_start, None
+
+    result = {}
+
+    def target():
+        cpu_start = time.thread_time()
+        try:
+            result["value"] = decision()
+        except Exception as e:
+            result["error"] = e
+        result["cpu"] = time.thread_time() - cpu_start
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return None, "timeout", None, thread
+    if "error" in result:
+        return None, "error", result["cpu"], None
+    return result["value"], None, result["cpu"], None
+
+
+def __fallback_action(fallback: type[BaseAgent], name: str, state: dict[str, Any]) -> str:
+    """
+    Returns the action chosen by an agent of class `fallback` in the place of
+    the agent `name`, based on the current state of the game.
+    """
+    fallback_agent = fallback(name)
+    fallback_agent.give_state_of_game(delta.state_delta(state, name) if fallback_agent.delta_state else state)
+    return fallback_agent.interrogate()
 
 
-def __return_leaderboard(game_, state_history) -> pd.DataFrame:
+def __return_leaderboard(game_) -> "pd.DataFrame":
 
     # Define the leaderboard, where keys are name of the characters and values
     # are their final rank in the game (1 for the winner, 2 for the
-    # second place, etc.)
+    # second place, etc.), as recorded by the game when they died
     leaderboard = {
         "game_id": [],
         "character_name": [],
         "rank": [],
+        "turns": [],
+        "cause_of_death": [],
+        "kills": [],
     }
-
-    # Check each state to get the alive characters, in reverse order
-    for state in reversed(state_history):
-
-        alive_characters = state["game"]["state"]["alive_characters"]
-        number_of_entries_in_leaderboard = len(leaderboard["character_name"])
-
-        for character in alive_characters:
-            if character not in leaderboard["character_name"]:
-                leaderboard["game_id"].append(game_.id)
-                leaderboard["character_name"].append(character)
-                leaderboard["rank"].append(number_of_entries_in_leaderboard + 1)
+    for placement in game_.get_summary()["placements"]:
+        leaderboard["game_id"].append(game_.id)
+        for key in ["character_name", "rank", "turns", "cause_of_death", "kills"]:
+            leaderboard[key].append(placement[key])
 
     # Save the leaderboard to a TSV file
     # os.makedirs("logs", exist_ok=True)
+    import pandas as pd
     df = pd.DataFrame(leaderboard)
     # df.to_csv(os.path.join("logs", f"leaderboard_{game_.id}.tsv"), sep="\t", index=False, encoding="utf8")
     return df
@@ -128,12 +176,25 @@ def api(
     save_txt: bool = False,
     save_tsv: bool = False,
     return_leaderboard: bool = False,
+    return_summary: bool = False,
+    vectorized: bool = False,
+    store: Any | None = None,
+    instrumentation: Instrumentation | None = None,
+    measure_latency: bool = False,
+    decision_timeout: float | None = None,
+    fallback: type[BaseAgent] | None = None,
+    compression: Literal["gzip", "zstd"] | None = None,
+    seed: int | None = None,
 ) -> None | dict[str, Any]:
 
     # Check that all agents are unique
     names = [agent.name for agent in agents]
     assert len(names) == len(utils.unique(names)), "All agents must have unique names."
 
+    # Seed the game if asked to, so that it can be replayed from its seed
+    if seed is not None:
+        random.seed(seed)
+
     # Check if headless mode should be used
     if not verbose and not save_txt and not save_tsv:
         headless = True
@@ -147,81 +208,195 @@ def api(
         headless = False
 
     # Create the game object
-    game_ = game.Game(character_names=[agent.name for agent in agents], map_name=map_name, headless=headless)
-
-    # Start the game
-    game_.start_game()
-
-    # Define the state and the state history
-    state = {}
-    state_history = []
-
-    while not state or len(state["game"]["state"]["alive_characters"]) > 1:
-
-        # Get the current state of the game
-        state = game_.get_state_of_game()
-
-        # Save the state
-        state_history.append(state)
-
-        # Print the public messages
-        if verbose:
-            print(__str2border(""))
-            print(__messages2str(state["debug"]["messages"]))
-            print(__str2border(""))
-
-        # Send to all agents the state of the game
-        for agent in agents:
-
-            # If character has been dead last turn, skip
-            if len(state_history) >= 2 and not state_history[-2]["characters"][agent.name]["state"]["alive"]:
-                continue
-
-            # Communicate the state of the game to the agent
-            agent.give_state_of_game(state)
-
-        # If only a single character is left, exit the loop
-        if len(state["game"]["state"]["alive_characters"]) == 1:
-            break
-
-        # Ask each agent to make a decision
+    game_ = game.Game(
+        character_names=[agent.name for agent in agents],
+        map_name=map_name,
+        headless=headless,
+        vectorized=vectorized,
+        instrumentation=instrumentation,
+    )
+
+    # Measure the time taken by the agents if asked to
+    latencies = DecisionLatencies() if measure_latency else None
+    if latencies is not None:
+        measure = latencies.measure
+    else:
+        measure = lambda agents, call: contextlib.nullcontext({})
+
+    # Protect the game against agents that hang or fail if asked to: their
+    # decisions are then replaced by those of a `fallback` agent. An agent
+    # whose decision timed out is not called again (it does not observe the
+    # states, decide, or learn of its death) until the thread running the
+    # decision ends, so that the thread is the only one using the agent.
+    protect = decision_timeout is not None or fallback is not None
+    if protect:
+        fallback = fallback if fallback is not None else RandomAgent
+    busy: dict[str, threading.Thread] = {}
+
+    # Last state observed by each agent receiving deltas, which is the
+    # previous state unless the agent was busy, and agents informed of their
+    # death
+    observed_states: dict[str, dict[str, Any]] = {}
+    informed_deaths: set[str] = set()
+
+    # Write the game log as the game goes if asked to
+    # (compressed if asked to, see `shared.logs.open_log`)
+    txt_log = TextLogWriter(os.path.join("logs", f"log_{game_.id}.txt" + EXTENSIONS[compression])) if save_txt else None
+
+    # Play the game, closing the game log even if it fails
+    try:
+        # Start the game
+        game_.start_game()
+
+        # Define the state and the state history
+        state = {}
+        state_history = []
+
+        while not state or len(state["game"]["state"]["alive_characters"]) > 1:
+
+            # Get the current state of the game
+            state = game_.get_state_of_game()
+
+            # Agents whose decision that timed out has now ended can be called again
+            for name, thread in list(busy.items()):
+                if not thread.is_alive():
+                    del busy[name]
+
+            # Save the state. The whole history is only needed to save the full
+            # state history, otherwise only the previous state is kept.
+            state_history.append(state)
+            if not save_tsv:
+                del state_history[:-2]
+
+            # Save the debug messages to the game log
+            if txt_log is not None:
+                txt_log.write(__messages2str(state["debug"]["messages"]))
+
+            # Print the public messages
+            if verbose:
+                print(__str2border(""))
+                print(__messages2str(state["debug"]["messages"]))
+                print(__str2border(""))
+
+            # Get what changed since the previous state, for agents that only
+            # receive deltas. Agents observe every state until they die, so the
+            # previous state is also their last observation.
+            previous_state = state_history[-2] if len(state_history) >= 2 else None
+            if any(agent.delta_state for agent in agents):
+                game_delta = delta.game_delta(state, previous_state)
+
+            # Send to all agents the state of the game
+            for agent in agents:
+
+                # If character has been dead last turn, or the agent is busy, skip
+                if len(state_history) >= 2 and not state_history[-2]["characters"][agent.name]["state"]["alive"]:
+                    continue
+                if agent.name in busy:
+                    continue
+
+                # Communicate the state of the game to the agent
+                if agent.delta_state:
+                    observed_state = observed_states.get(agent.name)
+                    observation = delta.state_delta(state, agent.name, observed_state, shared=game_delta if observed_state is previous_state else None)
+                    observed_states[agent.name] = state
+                else:
+                    observation = state
+                with measure([agent], "give_state_of_game"):
+                    agent.give_state_of_game(observation)
+
+            # If only a single character is left, exit the loop
+            if len(state["game"]["state"]["alive_characters"]) == 1:
+                break
+
+            # Check which agents are still alive. If dead, do only inform about
+            # the death if it has not been done already (or once the agent is no
+            # longer busy).
+            alive_agents = []
+            for agent in agents:
+                if not state["characters"][agent.name]["state"]["alive"]:
+                    if agent.name not in informed_deaths and agent.name not in busy:
+                        agent.inform_death()
+                        informed_deaths.add(agent.name)
+                else:
+                    alive_agents.append(agent)
+
+            # Ask the agents still alive to make a decision, all agents of a same
+            # class at once if the class is vectorized (otherwise one agent at a
+            # time, so that each agent has its own deadline and is timed on
+            # their own)
+            agents_by_class: dict[type, list[Agent]] = {}
+            for agent in alive_agents:
+                if agent.name not in busy:
+                    agents_by_class.setdefault(type(agent), []).append(agent)
+            actions: dict[str, str] = {}
+            failures: dict[str, str | None] = {agent.name: "busy" for agent in alive_agents if agent.name in busy}
+            for agent_class, class_agents in agents_by_class.items():
+                if not agent_class.is_vectorized():
+                    for agent in class_agents:
+                        with measure([agent], "interrogate") as timing:
+                            actions[agent.name], failures[agent.name], timing["cpu"], thread = __decide(agent.interrogate, decision_timeout, protect)
+                        if thread is not None:
+                            busy[agent.name] = thread
+                else:
+                    with measure(class_agents, "interrogate_batch") as timing:
+                        class_actions, failure, timing["cpu"], thread = __decide(lambda: agent_class.interrogate_batch(class_agents), decision_timeout, protect)
+                    for i, agent in enumerate(class_agents):
+                        actions[agent.name], failures[agent.name] = class_actions[i] if failure is None else None, failure
+                        if thread is not None:
+                            busy[agent.name] = thread
+
+            # Use the fallback actions of agents that did not decide in time (or
+            # are still busy with a decision that did not)
+            for agent in alive_agents:
+                if failures[agent.name] is not None:
+                    actions[agent.name] = __fallback_action(fallback, agent.name, state)
+                    game_.record_fallback(agent.name, failures[agent.name])
+
+            # Send the decisions to the game
+            for agent in alive_agents:
+                game_.set_action(agent.name, actions[agent.name])
+
+            # Update the game once all agents have made their decisions
+            game_.update_game()
+    finally:
+        if txt_log is not None:
+            txt_log.close()
+
+        # Let the agents release what they kept open during the game (except
+        # those still busy with a decision that timed out)
         for agent in agents:
-
-            # Check if still alive. If dead, do only inform about the death
-            # if it has not been done already. If still alive, ask for a
-            # decision.
-            if not state["characters"][agent.name]["state"]["alive"]:
-                if len(state_history) >= 2 and state_history[-2]["characters"][agent.name]["state"]["alive"]:
-                    agent.inform_death()
-                continue
-            else:
-                action = agent.interrogate()
-                # print(f"{agent.name} decided to {action}.")
-
-            # Send the decision to the game
-            game_.set_action(agent.name, action)
-
-        # Update the game once all agents have made their decisions
-        game_.update_game()
+            if agent.name not in busy:
+                agent.inform_end_of_game()
 
     # Print the winner
     if verbose:
         print("Game over! Winner is " + utils.smart_join(lst=[c.name for c in game_.get_alive_characters()], sep=", ", last_sep=" and ") + "!")
+        if latencies is not None:
+            print(latencies.summary())
 
     values_to_return: dict[str, Any] = {}
 
-    # Save the game log
-    if save_txt:
-        __save_txt(game_, state_history)
-
     # Save the full state history
     if save_tsv:
-        __save_tsv(game_, state_history)
+        __save_tsv(game_, state_history, compression)
 
     # Save the leaderboard
     if return_leaderboard:
-        leaderboard = __return_leaderboard(game_, state_history)
+        leaderboard = __return_leaderboard(game_)
         values_to_return["leaderboard"] = leaderboard
 
+    # Return the summary of the game
+    if return_summary:
+        values_to_return["summary"] = game_.get_summary()
+
+    # Return the time taken by the agents
+    if latencies is not None:
+        values_to_return["latency"] = latencies.report()
+
+    # Append the summary of the game to a results store (e.g. an
+    # `experiments.ResultStore`)
+    if store is not None:
+        store.add(game_.get_summary(), agents, seed=seed)
+
     # Return
     return None if not values_to_return else values_to_return
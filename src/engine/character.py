@@ -230,9 +230,9 @@ class Character:
 
         # Print a debug message
         if value > 0:
-            self.__game.save_message("🎉✅ Hype for {character} increased by {hype}".format(character=self.name, hype=value), channel="debug")
+            self.__game.save_message("🎉✅ Hype for {character} increased by {hype}", fmt={"character": self.name, "hype": value}, channel="debug")
         elif value < 0:
-            self.__game.save_message("🎉❌ Hype for {character} decreased by {hype}".format(character=self.name, hype=abs(value)), channel="debug")
+            self.__game.save_message("🎉❌ Hype for {character} decreased by {hype}", fmt={"character": self.name, "hype": abs(value)}, channel="debug")
 
 
     def loot(self, dead_character: "Character") -> None:
@@ -241,18 +241,18 @@ class Character:
         hype of the dead character.
         """
         # Print the looting messages to the stealing character's channel
-        self.__game.save_message("💰💰 You have looted {attacked_character}'s body".format(attacked_character=dead_character.name), channel=self.name)
-        self.__game.save_message("💰🍒 Received {food} food".format(food=dead_character.bag.food), channel=self.name)
-        self.__game.save_message("💰💧 Received {water} water".format(water=dead_character.bag.water), channel=self.name)
+        self.__game.save_message("💰💰 You have looted {attacked_character}'s body", fmt={"attacked_character": dead_character.name}, channel=self.name)
+        self.__game.save_message("💰🍒 Received {food} food", fmt={"food": dead_character.bag.food}, channel=self.name)
+        self.__game.save_message("💰💧 Received {water} water", fmt={"water": dead_character.bag.water}, channel=self.name)
         if len(dead_character.bag.weapons) > 0:
-            self.__game.save_message("💰🔪 Received {weapons}".format(weapons=", ".join([w.name for w in dead_character.bag.weapons])), channel=self.name)
+            self.__game.save_message("💰🔪 Received {weapons}", fmt={"weapons": ", ".join([w.name for w in dead_character.bag.weapons])}, channel=self.name)
 
         # Print the looting messages to the debug channel
-        self.__game.save_message("💰💰 {attacking_character} has looted {attacked_character}'s body".format(attacking_character=self.name, attacked_character=dead_character.name), channel="debug")
-        self.__game.save_message("💰🍒 {attacking_character} has looted {food} food".format(attacking_character=self.name, food=dead_character.bag.food), channel="debug")
-        self.__game.save_message("💰💧 {attacking_character} has looted {water} water".format(attacking_character=self.name, water=dead_character.bag.water), channel="debug")
+        self.__game.save_message("💰💰 {attacking_character} has looted {attacked_character}'s body", fmt={"attacking_character": self.name, "attacked_character": dead_character.name}, channel="debug")
+        self.__game.save_message("💰🍒 {attacking_character} has looted {food} food", fmt={"attacking_character": self.name, "food": dead_character.bag.food}, channel="debug")
+        self.__game.save_message("💰💧 {attacking_character} has looted {water} water", fmt={"attacking_character": self.name, "water": dead_character.bag.water}, channel="debug")
         if len(dead_character.bag.weapons) > 0:
-            self.__game.save_message("💰🔪 {attacking_character} has looted {weapons}".format(attacking_character=self.name, weapons=", ".join([w.name for w in dead_character.bag.weapons])), channel="debug")
+            self.__game.save_message("💰🔪 {attacking_character} has looted {weapons}", fmt={"attacking_character": self.name, "weapons": ", ".join([w.name for w in dead_character.bag.weapons])}, channel="debug")
 
         # Transfer the resources
         self.bag.steal(dead_character.bag)
@@ -296,9 +296,9 @@ class Character:
             self.alive = False
             self.statistics["cause_of_death"] = "killed"
             self.__game.save_message("💀🔪 You have been killed", channel=self.name)
-            self.__game.save_message("💀🔪 You killed {attacked_character}".format(attacked_character=self.name), channel=other.name)
-            self.__game.save_message("💀🔪 {attacked_character} has been killed".format(attacked_character=self.name), channel="public", anti_channels=[self.name, other.name])
-            self.__game.save_message("💀🔪 {attacked_character} has been killed by {attacking_character}".format(attacked_character=self.name, attacking_character=other.name), channel="debug")
+            self.__game.save_message("💀🔪 You killed {attacked_character}", fmt={"attacked_character": self.name}, channel=other.name)
+            self.__game.save_message("💀🔪 {attacked_character} has been killed", fmt={"attacked_character": self.name}, channel="public", anti_channels=[self.name, other.name])
+            self.__game.save_message("💀🔪 {attacked_character} has been killed by {attacking_character}", fmt={"attacked_character": self.name, "attacking_character": other.name}, channel="debug")
             for channel in [c.name for c in self.__game.get_alive_characters() if c != other]:
                 self.__game.save_message("💀💀 A tribute has fallen", channel=channel)
 
@@ -349,101 +349,211 @@ class Character:
         self.change_hype(hype_gain)
 
 
-    def gather(self) -> None:
+    def gather(self, outcome: tuple[bool, int, int, tuple | None] | None = None) -> None:
         """
         Gather resources. The character may find food, water, and weapons.
-        The probability of finding resources is lower at night.
+        The probability of finding resources is lower at night. If `outcome`
+        is given (see `draw_gather_outcomes`), it is used instead of rolling
+        the dice.
         """
-        # Compute the success rate
-        success_proba = RESOURCE_GATHER_PROBA_WHILE_GATHERING
-        if self.__game.time == "night":
-            success_proba *= NIGHT_PROBABILITY_FACTOR
+        # Roll the dice
+        if outcome is None:
+
+            # Compute the success rate
+            success_proba = RESOURCE_GATHER_PROBA_WHILE_GATHERING
+            if self.__game.time == "night":
+                success_proba *= NIGHT_PROBABILITY_FACTOR
+
+            # If the character succeeded to gather
+            if random_bool(success_proba):
+
+                # If the character found resources (and thus not a weapon)
+                if not random_bool(WEAPON_GATHER_PROBA_WHILE_GATHERING * self.__game.map_.cells[self.position].weapon_proba_multiplier):
+                    resources = random.randint(MIN_RESOURCES_WHILE_GATHERING, MAX_RESOURCES_WHILE_GATHERING)
+                    food = random.randint(0, resources)
+                    water = resources - food
+                    outcome = (True, food, water, None)
+
+                # If a weapon is found instead, check if it is dangerous or not
+                elif random_bool(self.__game.map_.cells[self.position].dangerous_weapon_proba):
+                    outcome = (True, 0, 0, random.choice(WEAPONS))
+                else:
+                    outcome = (True, 0, 0, random.choice(NATURE_WEAPONS))
 
-        # If the character succeeded to gather
-        if random_bool(success_proba):
-
-            # If the character found resources (and thus not a weapon)
-            if not random_bool(WEAPON_GATHER_PROBA_WHILE_GATHERING * self.__game.map_.cells[self.position].weapon_proba_multiplier):
-                resources = random.randint(MIN_RESOURCES_WHILE_GATHERING, MAX_RESOURCES_WHILE_GATHERING)
-                food = random.randint(0, resources)
-                water = resources - food
-                food *= self.__game.map_.cells[self.position].food_multiplier
-                water *= self.__game.map_.cells[self.position].water_multiplier
-                food = round(food)
-                water = round(water)
-                self.bag.food += food
-                self.bag.water += water
-                if food > 0 and water > 0:
-                    self.__game.save_message("🌾✅ You found some food and water", channel=self.name)
-                elif food > 0 and water == 0:
-                    self.__game.save_message("🌾✅ You found some food", channel=self.name)
-                elif food == 0 and water > 0:
-                    self.__game.save_message("🌾✅ You found some water", channel=self.name)
-                self.__game.save_message("🌾✅ {character} gathered {food} food and {water} water".format(character=self.name, food=food, water=water), channel="debug")
-
-            # If a weapon is found instead
+            # If the character failed to gather
             else:
-
-                # Check if the weapon is dangerous or not
-                if random_bool(self.__game.map_.cells[self.position].dangerous_weapon_proba):
-                    weapon_tuple: tuple = random.choice(WEAPONS)
-                else:
-                    weapon_tuple: tuple = random.choice(NATURE_WEAPONS)
-                weapon = Weapon(name=weapon_tuple[0], damage=weapon_tuple[1])
-                self.bag.add_weapon(weapon)
-                self.__game.save_message("🌾🔪 You found {weapon}".format(weapon=weapon.name), channel=self.name)
-                self.__game.save_message("🌾🔪 {character} found {weapon}".format(character=self.name, weapon=weapon.name), channel="debug")
+                outcome = (False, 0, 0, None)
+
+        success, food, water, weapon_tuple = outcome
+
+        # If the character found resources (and thus not a weapon)
+        if success and weapon_tuple is None:
+            food *= self.__game.map_.cells[self.position].food_multiplier
+            water *= self.__game.map_.cells[self.position].water_multiplier
+            food = round(food)
+            water = round(water)
+            self.bag.food += food
+            self.bag.water += water
+            if food > 0 and water > 0:
+                self.__game.save_message("🌾✅ You found some food and water", channel=self.name)
+            elif food > 0 and water == 0:
+                self.__game.save_message("🌾✅ You found some food", channel=self.name)
+            elif food == 0 and water > 0:
+                self.__game.save_message("🌾✅ You found some water", channel=self.name)
+            self.__game.save_message("🌾✅ {character} gathered {food} food and {water} water", fmt={"character": self.name, "food": food, "water": water}, channel="debug")
+
+        # If a weapon is found instead
+        elif success:
+            weapon = Weapon(name=weapon_tuple[0], damage=weapon_tuple[1])
+            self.bag.add_weapon(weapon)
+            self.__game.save_message("🌾🔪 You found {weapon}", fmt={"weapon": weapon.name}, channel=self.name)
+            self.__game.save_message("🌾🔪 {character} found {weapon}", fmt={"character": self.name, "weapon": weapon.name}, channel="debug")
 
         # If the character failed to gather
         else:
             self.__game.save_message("🌾❌ You failed to gather", channel=self.name)
-            self.__game.save_message("🌾❌ {character} failed to gather".format(character=self.name), channel="debug")
+            self.__game.save_message("🌾❌ {character} failed to gather", fmt={"character": self.name}, channel="debug")
 
         # Change the hype
         self.change_hype(HYPE_WHEN_GATHERING)
 
 
-    def hide(self):
+    def hide(self, outcome: tuple[bool, int, int, tuple | None] | None = None) -> None:
         """
         Hide. The character may find food, water, and weapons, but with
         usually very low probabilities. The character is not impacted by the
-        time of day.
-        """
-
-        # If the character found resources of any kind
-        if random_bool(RESOURCE_GATHER_PROBA_WHILE_HIDING):
-
-            # If the character found resources (and thus not a weapon)
-            if not random_bool(WEAPON_GATHER_PROBA_WHILE_HIDING  * self.__game.map_.cells[self.position].weapon_proba_multiplier):
-                resources = random.randint(MIN_RESOURCES_WHILE_HIDING, MAX_RESOURCES_WHILE_HIDING)
-                food = random.randint(0, resources)
-                water = resources - food
-                food *= self.__game.map_.cells[self.position].food_multiplier
-                water *= self.__game.map_.cells[self.position].water_multiplier
-                if food > 0 and water > 0:
-                    self.__game.save_message("👻🍒 You found some food while hiding", channel=self.name)
-                elif food > 0 and water == 0:
-                    self.__game.save_message("👻💧 You found some water while hiding", channel=self.name)
-                elif food == 0 and water > 0:
-                    self.__game.save_message("👻🌾 You found some food and water while hiding", channel=self.name)
-                self.__game.save_message("👻✅ {character} found {food} food and {water} water while hiding".format(character=self.name, food=food, water=water), channel="debug")
-
-            # If a weapon is found instead
+        time of day. If `outcome` is given (see `draw_hide_outcomes`), it is
+        used instead of rolling the dice.
+        """
+        # Roll the dice
+        if outcome is None:
+
+            # If the character found resources of any kind
+            if random_bool(RESOURCE_GATHER_PROBA_WHILE_HIDING):
+
+                # If the character found resources (and thus not a weapon)
+                if not random_bool(WEAPON_GATHER_PROBA_WHILE_HIDING  * self.__game.map_.cells[self.position].weapon_proba_multiplier):
+                    resources = random.randint(MIN_RESOURCES_WHILE_HIDING, MAX_RESOURCES_WHILE_HIDING)
+                    food = random.randint(0, resources)
+                    water = resources - food
+                    outcome = (True, food, water, None)
+
+                # If a weapon is found instead
+                else:
+                    outcome = (True, 0, 0, random.choice(NATURE_WEAPONS))
+
+            # If the character found nothing
             else:
-                weapon_tuple: tuple = random.choice(NATURE_WEAPONS)
-                weapon: Weapon = Weapon(name=weapon_tuple[0], damage=weapon_tuple[1])
-                self.bag.add_weapon(weapon)
-                self.__game.save_message("👻🔪 You found {weapon} while hiding".format(weapon=weapon.name), channel=self.name)
-                self.__game.save_message("👻🔪 {character} found {weapon} while hiding".format(character=self.name, weapon=weapon.name), channel="debug")
+                outcome = (False, 0, 0, None)
+
+        success, food, water, weapon_tuple = outcome
+
+        # If the character found resources (and thus not a weapon)
+        if success and weapon_tuple is None:
+            food *= self.__game.map_.cells[self.position].food_multiplier
+            water *= self.__game.map_.cells[self.position].water_multiplier
+            if food > 0 and water > 0:
+                self.__game.save_message("👻🍒 You found some food while hiding", channel=self.name)
+            elif food > 0 and water == 0:
+                self.__game.save_message("👻💧 You found some water while hiding", channel=self.name)
+            elif food == 0 and water > 0:
+                self.__game.save_message("👻🌾 You found some food and water while hiding", channel=self.name)
+            self.__game.save_message("👻✅ {character} found {food} food and {water} water while hiding", fmt={"character": self.name, "food": food, "water": water}, channel="debug")
+
+        # If a weapon is found instead
+        elif success:
+            weapon: Weapon = Weapon(name=weapon_tuple[0], damage=weapon_tuple[1])
+            self.bag.add_weapon(weapon)
+            self.__game.save_message("👻🔪 You found {weapon} while hiding", fmt={"weapon": weapon.name}, channel=self.name)
+            self.__game.save_message("👻🔪 {character} found {weapon} while hiding", fmt={"character": self.name, "weapon": weapon.name}, channel="debug")
 
         # If the character found nothing
         else:
-            self.__game.save_message("👻❌ {character} didn't find anything while hiding".format(character=self.name), channel="debug")
+            self.__game.save_message("👻❌ {character} didn't find anything while hiding", fmt={"character": self.name}, channel="debug")
 
         # Change the hype
         self.change_hype(HYPE_WHEN_HIDING)
 
 
+    @staticmethod
+    def draw_gather_outcomes(characters: list["Character"]) -> list[tuple[bool, int, int, tuple | None]]:
+        """
+        Roll the dice of `gather` for all the given characters at once. Returns
+        one outcome per character, to be given to `gather`.
+        """
+        import numpy as np  # only for the vectorized resolution
+
+        n = len(characters)
+        if n == 0:
+            return []
+        game = characters[0].__game
+        rng = game.get_rng()
+        cells = [game.map_.cells[c.position] for c in characters]
+
+        # Compute the success rate
+        success_proba = RESOURCE_GATHER_PROBA_WHILE_GATHERING
+        if game.time == "night":
+            success_proba *= NIGHT_PROBABILITY_FACTOR
+
+        # Roll all the dice at once
+        success = rng.random(n) < success_proba
+        found_weapon = rng.random(n) < WEAPON_GATHER_PROBA_WHILE_GATHERING * np.array([cell.weapon_proba_multiplier for cell in cells])
+        resources = rng.integers(MIN_RESOURCES_WHILE_GATHERING, MAX_RESOURCES_WHILE_GATHERING + 1, size=n)
+        food = (rng.random(n) * (resources + 1)).astype(int)
+        water = resources - food
+        dangerous = rng.random(n) < np.array([cell.dangerous_weapon_proba for cell in cells])
+        weapon = np.where(dangerous, rng.integers(len(WEAPONS), size=n), rng.integers(len(NATURE_WEAPONS), size=n))
+
+        # Build the outcomes
+        outcomes = []
+        for success_, found_weapon_, food_, water_, dangerous_, weapon_ in zip(
+            success.tolist(), found_weapon.tolist(), food.tolist(), water.tolist(), dangerous.tolist(), weapon.tolist(),
+        ):
+            if not success_:
+                outcomes.append((False, 0, 0, None))
+            elif not found_weapon_:
+                outcomes.append((True, food_, water_, None))
+            else:
+                outcomes.append((True, 0, 0, WEAPONS[weapon_] if dangerous_ else NATURE_WEAPONS[weapon_]))
+        return outcomes
+
+
+    @staticmethod
+    def draw_hide_outcomes(characters: list["Character"]) -> list[tuple[bool, int, int, tuple | None]]:
+        """
+        Roll the dice of `hide` for all the given characters at once. Returns
+        one outcome per character, to be given to `hide`.
+        """
+        import numpy as np  # only for the vectorized resolution
+
+        n = len(characters)
+        if n == 0:
+            return []
+        game = characters[0].__game
+        rng = game.get_rng()
+
+        # Roll all the dice at once
+        success = rng.random(n) < RESOURCE_GATHER_PROBA_WHILE_HIDING
+        found_weapon = rng.random(n) < WEAPON_GATHER_PROBA_WHILE_HIDING * np.array([game.map_.cells[c.position].weapon_proba_multiplier for c in characters])
+        resources = rng.integers(MIN_RESOURCES_WHILE_HIDING, MAX_RESOURCES_WHILE_HIDING + 1, size=n)
+        food = (rng.random(n) * (resources + 1)).astype(int)
+        water = resources - food
+        weapon = rng.integers(len(NATURE_WEAPONS), size=n)
+
+        # Build the outcomes
+        outcomes = []
+        for success_, found_weapon_, food_, water_, weapon_ in zip(
+            success.tolist(), found_weapon.tolist(), food.tolist(), water.tolist(), weapon.tolist(),
+        ):
+            if not success_:
+                outcomes.append((False, 0, 0, None))
+            elif not found_weapon_:
+                outcomes.append((True, food_, water_, None))
+            else:
+                outcomes.append((True, 0, 0, NATURE_WEAPONS[weapon_]))
+        return outcomes
+
+
     def rest(self) -> None:
         """
         Rest. The character regains some energy. NOTE: this method should only
@@ -457,61 +567,40 @@ class Character:
 
 
     def evolve(self, time: Literal["day", "night"]) -> None:
+        """
+        Make the character evolve at the end of a turn. The outcome is computed
+        here, character by character, and reported by the same methods as
+        `evolve_all` (see the cases described there).
+        """
 
         # Hype: Each turn, a character might receive a gift if their hype is high enough
         if random_bool(self.hype / MAX_HYPE):
-            self.__game.save_message("🎁🎉 An unknown sponsor sent a gift to {character}".format(character=self.name), channel="public")
-            self.__game.save_message("🎁🎉 An unknown sponsor sent a gift to {character} (proba = {proba:.0%})".format(character=self.name, proba=self.hype / MAX_HYPE), channel="debug")
             potential_gift = []
             if self.bag.water == 0 and self.thirst < MAX_THIRST:
-                potential_gift.append("water")
+                potential_gift.append(0)
             if self.bag.food == 0 and self.hunger < MAX_HUNGER:
-                potential_gift.append("food")
+                potential_gift.append(1)
             if self.health < MAX_HEALTH:
-                potential_gift.append("medecine")
+                potential_gift.append(2)
             if len(self.bag.weapons) == 0:
-                potential_gift.append("weapon")
-
-            # If the fullfills at least one gift condition
-            if len(potential_gift) > 0:
-
-                # Choose a gift
-                gift = random.choice(potential_gift)
-                if gift == "water":
-                    delta_water = GIFT_WATER
-                    self.bag.water += delta_water
-                    self.__game.save_message("🎁💧 You received some water from an unknown sponsor", channel=self.name)
-                    self.__game.save_message("🎁💧 {character} received {water} water from an unknown sponsor".format(character=self.name, water=delta_water), channel="debug")
-                if gift == "food":
-                    delta_food = GIFT_FOOD
-                    self.bag.food += delta_food
-                    self.__game.save_message("🎁🍒 You received some food from an unknown sponsor", channel=self.name)
-                    self.__game.save_message("🎁🍒 {character} received {food} food from an unknown sponsor".format(character=self.name, food=delta_food), channel="debug")
-                if gift == "medecine":
-                    delta_health = GIFT_HEALTH
-                    self.health = min(self.health + delta_health, MAX_HEALTH)
-                    self.__game.save_message("🎁💊 You received some medecine from an unknown sponsor", channel=self.name)
-                    self.__game.save_message("🎁💊 {character}'s health was restored by {health} thanks to medecine sent by the unknown sponsor".format(character=self.name, health=delta_health), channel="debug")
-                if gift == "weapon":
-                    weapon_tuple: tuple = random.choice(WEAPONS)
-                    weapon: Weapon = Weapon(name=weapon_tuple[0], damage=weapon_tuple[1])
-                    self.bag.add_weapon(weapon)
-                    self.__game.save_message("🎁🔪 You received {weapon} from an unknown sponsor".format(weapon=weapon.name), channel=self.name)
-                    self.__game.save_message("🎁🔪 {character} received {weapon} from an unknown sponsor".format(character=self.name, weapon=weapon.name), channel="debug")
-
-                # The gift also restores some mental
-                if self.mental < MAX_MENTAL:
-                    self.mental += 1
-                    self.__game.save_message("🎁❤️‍🩹 The gift made you feel a bit happier", channel=self.name)
-                    self.__game.save_message("🎁❤️‍🩹 {character} feels a bit happier thanks to the gift".format(character=self.name), channel="debug")
-
-                # Update statistics
-                self.statistics["gifts_received"] += 1
-
-            # If the character has no need for a gift, the drone crashes
-            else:
-                self.__game.save_message("🎁❌ The drone sending your gift crashed in a tree and has been destroyed", channel=self.name)
-                self.__game.save_message("🎁❌ The gift for {character} could not be delivered".format(character=self.name), channel="debug")
+                potential_gift.append(3)
+
+            # Choose a gift if the character fullfills at least one gift
+            # condition, otherwise the drone crashes
+            gift = random.choice(potential_gift) if len(potential_gift) > 0 else -1
+            weapon_index = random.randrange(len(WEAPONS)) if gift == 3 else 0
+            if gift == 0:
+                self.bag.water += GIFT_WATER
+            elif gift == 1:
+                self.bag.food += GIFT_FOOD
+            elif gift == 2:
+                self.health = min(self.health + GIFT_HEALTH, MAX_HEALTH)
+
+            # The gift also restores some mental
+            happier = gift != -1 and self.mental < MAX_MENTAL
+            if happier:
+                self.mental += 1
+            self.__receive_gift(self.hype / MAX_HYPE, gift, weapon_index, happier)
 
             # Lower the hype
             self.hype = MAX_HYPE // 2
@@ -526,114 +615,377 @@ class Character:
 
         # Thirst
         if self.bag.water >= 1:
+            thirst_case = 0
             self.bag.water -= 1
             self.thirst = MAX_THIRST
-            self.__game.save_message("💧✅ You drinked some water", channel=self.name)
-            self.__game.save_message("💧✅ {character} drinks water ({water} left)".format(character=self.name, water=self.bag.water), channel="debug")
         elif self.thirst > MAX_THIRST // 2:
+            thirst_case = 1
             self.thirst -= 1
-            self.__game.save_message("💧❌ You are slightly thirsty", channel=self.name)
-            # self.__game.save_message("💧❌ {character} is thirsty and might die in {turns} turns".format(character=self.name, turns=self.thirst+1), channel="debug")
         elif self.thirst > 1:
+            thirst_case = 2
             self.thirst -= 1
-            self.__game.save_message("💧❌ You are thirsty", channel=self.name)
-            self.__game.save_message("💧❌ {character} is thirsty and might die in {turns} turns".format(character=self.name, turns=self.thirst+1), channel="debug")
         elif self.thirst == 1:
+            thirst_case = 3
             self.thirst -= 1
-            self.__game.save_message("💧❌ You are deshydrated and will die next turn if you don't manage to find water", channel=self.name)
-            self.__game.save_message("💧❌ {character} is deshydrated and might die next turn".format(character=self.name), channel="debug")
         else:
-            self.alive = False
-            self.statistics["cause_of_death"] = "thirst"
-            self.__game.save_message("💀💧 You died of thirst", channel=self.name)
-            self.__game.save_message("💀💧 {character} died of thirst".format(character=self.name), channel="public", anti_channels=self.name)
-            self.__game.save_message("💀💧 {character} died of thirst".format(character=self.name), channel="debug")
-            for channel in [c.name for c in self.__game.get_alive_characters()]:
-                self.__game.save_message("💀💀 A tribute has fallen", channel=channel)
-            return
+            thirst_case = 4
 
         # Hunger
-        if self.bag.food >= 1:
+        if thirst_case == 4:
+            hunger_case = -1
+        elif self.bag.food >= 1:
+            hunger_case = 0
             self.bag.food -= 1
             self.hunger = MAX_HUNGER
-            self.__game.save_message("🍒✅ You ate some food", channel=self.name)
-            self.__game.save_message("🍒✅ {character} ate food ({food} left)".format(character=self.name, food=self.bag.food), channel="debug")
         elif self.hunger > MAX_HUNGER // 2:
+            hunger_case = 1
             self.hunger -= 1
-            self.__game.save_message("🍒❌ You are slightly hungry", channel=self.name)
-            # self.__game.save_message("🍒❌ {character} is hungry and might die in {turns} turns".format(character=self.name, turns=self.hunger+1), channel="debug")
         elif self.hunger > 1:
+            hunger_case = 2
             self.hunger -= 1
-            self.__game.save_message("🍒❌ You are hungry", channel=self.name)
-            self.__game.save_message("🍒❌ {character} is hungry and might die in {turns} turns".format(character=self.name, turns=self.hunger+1), channel="debug")
         elif self.hunger == 1:
+            hunger_case = 3
             self.hunger -= 1
-            self.__game.save_message("🍒❌ You are starving and will die next turn if you don't manage to find food", channel=self.name)
-            self.__game.save_message("🍒❌ {character} is starving and might die next turn".format(character=self.name), channel="debug")
         else:
-            self.alive = False
-            self.statistics["cause_of_death"] = "hunger"
-            self.__game.save_message("💀🍒 You died of hunger", channel=self.name)
-            self.__game.save_message("💀🍒 {character} died of hunger".format(character=self.name), channel="public", anti_channels=[self.name])
-            self.__game.save_message("💀🍒 {character} died of hunger".format(character=self.name), channel="debug")
-            for channel in [c.name for c in self.__game.get_alive_characters()]:
-                self.__game.save_message("💀💀 A tribute has fallen", channel=channel)
-            return
+            hunger_case = 4
 
         # Energy: if a character does not rest during the night, they will lose
         # 1 energy. If they have no energy, they will lose mental health
         # instead. During the day, energy does not change.
+        if time != "night" or thirst_case == 4 or hunger_case == 4:
+            energy_case = -1
+        elif self.__current_action == "rest":
+            energy_case = 0
+        elif self.energy > 1:
+            energy_case = 1
+            self.energy -= 1
+        elif self.energy == 1:
+            energy_case = 2
+            self.energy -= 1
+        elif self.mental > 1:
+            energy_case = 3
+            self.mental -= 1
+        elif self.mental == 1:
+            energy_case = 4
+            self.mental -= 1
+        else:
+            energy_case = 5
+
+        # Report the evolution, and kill the character if needed
+        if thirst_case == 4:
+            cause_of_death = "thirst"
+        elif hunger_case == 4:
+            cause_of_death = "hunger"
+        elif energy_case == 5:
+            cause_of_death = "madness"
+        elif self.health == 0:
+            cause_of_death = "health"
+        else:
+            cause_of_death = ""
+        self.__report_evolution(time, thirst_case, hunger_case, energy_case, cause_of_death)
+        if cause_of_death:
+            return
+
+        # Clears the number of spotted characters
+        self.current_spotted_characters = 0
+
+        # Reset action (should be performed last)
+        self.__current_action = "none"
+
+
+    @staticmethod
+    def evolve_all(characters: list["Character"], time: Literal["day", "night"]) -> None:
+        """
+        Make all the given (alive) characters evolve at once. The rules are the
+        same as calling `evolve` on each character in order, but the gift
+        rolls, the water and food consumption, the fatigue and the deaths are
+        computed for the whole population in a single vectorized pass. Only the
+        write-back of the results and the messages are done character by
+        character, in the same order as `evolve`, so that deaths happen (and
+        are announced) in the same order.
+        """
+        import numpy as np  # only for the vectorized resolution
+
+        n = len(characters)
+        if n == 0:
+            return
+        rng = characters[0].__game.get_rng()
+
+        # Get the vitals of all characters
+        hype = np.array([c.hype for c in characters])
+        health = np.array([c.health for c in characters])
+        mental = np.array([c.mental for c in characters])
+        energy = np.array([c.energy for c in characters])
+        hunger = np.array([c.hunger for c in characters])
+        thirst = np.array([c.thirst for c in characters])
+        food = np.array([c.bag.food for c in characters])
+        water = np.array([c.bag.water for c in characters])
+        weapons_count = np.array([len(c.bag.weapons) for c in characters])
+        is_resting = np.array([c.__current_action == "rest" for c in characters])
+
+        # Hype: each character might receive a gift if their hype is high
+        # enough. The gift is chosen uniformly among the ones the character
+        # needs (water, food, medecine, weapon), if any.
+        gift_proba = hype / MAX_HYPE
+        gift_sent = rng.random(n) < gift_proba
+        potential_gifts = np.stack([
+            (water == 0) & (thirst < MAX_THIRST),
+            (food == 0) & (hunger < MAX_HUNGER),
+            health < MAX_HEALTH,
+            weapons_count == 0,
+        ], axis=1) & gift_sent[:, None]
+        potential_gifts_count = potential_gifts.sum(axis=1)
+        gift_delivered = potential_gifts_count > 0
+        chosen_rank = (rng.random(n) * potential_gifts_count).astype(int) + 1
+        chosen_gift = np.argmax(potential_gifts & (np.cumsum(potential_gifts, axis=1) == chosen_rank[:, None]), axis=1)
+        gift = np.where(gift_delivered, chosen_gift, -1)
+        gift_weapon = rng.integers(len(WEAPONS), size=n)
+        water = water + (gift == 0) * GIFT_WATER
+        food = food + (gift == 1) * GIFT_FOOD
+        health = np.where(gift == 2, np.minimum(health + GIFT_HEALTH, MAX_HEALTH), health)
+        gift_happier = gift_delivered & (mental < MAX_MENTAL)
+        mental = mental + gift_happier
+        hype = np.where(gift_sent, MAX_HYPE // 2, hype)
+
+        # Thirst: 0 = drinks, 1 = slightly thirsty, 2 = thirsty, 3 = deshydrated,
+        # 4 = dies
+        thirst_case = np.select(
+            [water >= 1, thirst > MAX_THIRST // 2, thirst > 1, thirst == 1],
+            [0, 1, 2, 3],
+            default=4,
+        )
+        new_water = np.where(thirst_case == 0, water - 1, water)
+        new_thirst = np.where(thirst_case == 0, MAX_THIRST, np.where(thirst_case < 4, thirst - 1, thirst))
+
+        # Hunger: same cases as thirst, -1 if already dead
+        hunger_case = np.select(
+            [thirst_case == 4, food >= 1, hunger > MAX_HUNGER // 2, hunger > 1, hunger == 1],
+            [-1, 0, 1, 2, 3],
+            default=4,
+        )
+        new_food = np.where(hunger_case == 0, food - 1, food)
+        new_hunger = np.where(hunger_case == 0, MAX_HUNGER, np.where((hunger_case >= 1) & (hunger_case < 4), hunger - 1, hunger))
+
+        # Energy (only at night): 0 = rested, 1 = tired, 2 = exhausted,
+        # 3 = insane, 4 = last turn before dying, 5 = dies, -1 if nothing
+        # happens or if already dead
         if time == "night":
-            if self.__current_action == "rest":
-                self.__game.save_message("🛌✅ You have regained some energy", channel=self.name)
-                self.__game.save_message("🛌✅ {character} has regained 1 energy".format(character=self.name), channel="debug")
-            else:
-                if self.energy > 1:
-                    self.energy -= 1
-                    self.__game.save_message("🛌❌ You are tired", channel=self.name)
-                    self.__game.save_message("🛌❌ {character} is tired ({energy} energy left)", fmt={"character": self.name, "energy": self.energy}, channel="debug")
-                elif self.energy == 1:
-                    self.energy -= 1
-                    self.__game.save_message("🛌❌ You are exhausted", channel=self.name)
-                    self.__game.save_message("🛌❌ {character} is exhausted ({energy} energy left)", fmt={"character": self.name, "energy": self.energy}, channel="debug")
-                elif self.mental > 1:
-                    self.mental -= 1
-                    self.__game.save_message("🛌❌ Your lack of sleep is driving you insane, and you should rest within {turns} turns".format(turns=self.mental+1), channel=self.name)
-                    self.__game.save_message("🛌❌ {character}'s lack of sleep is driving them insane ({turns} turns before dying)".format(character=self.name, turns=self.mental+1), channel="debug")
-                elif  self.mental == 1:
-                    self.mental -= 1
-                    self.__game.save_message("🛌❌ Your lack of sleep is driving you insane, and you should rest immediately", channel=self.name)
-                    self.__game.save_message("🛌❌ {character}'s lack of sleep is driving them insane (last turns before dying)".format(character=self.name), channel="debug")
-                else:
-                    self.alive = False
-                    self.statistics["cause_of_death"] = "madness"
-                    self.__game.save_message("💀🧠 You killed yourself", channel=self.name)
-                    self.__game.save_message("💀🧠 {character} killed themself".format(character=self.name), channel="public", anti_channels=[self.name])
-                    self.__game.save_message("💀🧠 {character} killed themself".format(character=self.name), channel="debug")
-                    for channel in [c.name for c in self.__game.get_alive_characters()]:
-                        self.__game.save_message("💀💀 A tribute has fallen", channel=channel)
-                    return
+            energy_case = np.select(
+                [(thirst_case == 4) | (hunger_case == 4), is_resting, energy > 1, energy == 1, mental > 1, mental == 1],
+                [-1, 0, 1, 2, 3, 4],
+                default=5,
+            )
+        else:
+            energy_case = np.full(n, -1)
+        new_energy = np.where((energy_case == 1) | (energy_case == 2), energy - 1, energy)
+        new_mental = np.where((energy_case == 3) | (energy_case == 4), mental - 1, mental)
+
+        # Causes of death, in the order they are checked by `evolve`
+        dies_of_thirst = thirst_case == 4
+        dies_of_hunger = hunger_case == 4
+        dies_of_madness = energy_case == 5
+        dies_of_health = (health == 0) & ~(dies_of_thirst | dies_of_hunger | dies_of_madness)
+        dies = dies_of_thirst | dies_of_hunger | dies_of_madness | dies_of_health
+
+        # If all the characters before the last one die, the last one is the
+        # only one alive when its turn comes, and thus skips the evolution
+        # (see `evolve`)
+        evolves = np.ones(n, dtype=bool)
+        evolves[-1] = not dies[:-1].all()
+
+        # Write back the results, character by character
+        cause_of_death = np.select(
+            [dies_of_thirst, dies_of_hunger, dies_of_madness, dies_of_health],
+            ["thirst", "hunger", "madness", "health"],
+            default="",
+        )
+        columns = zip(
+            characters,
+            gift_sent.tolist(), gift_proba.tolist(), gift.tolist(), gift_weapon.tolist(), gift_happier.tolist(), hype.tolist(),
+            health.tolist(), mental.tolist(), food.tolist(), water.tolist(),
+            evolves.tolist(), thirst_case.tolist(), hunger_case.tolist(), energy_case.tolist(), cause_of_death.tolist(),
+            new_mental.tolist(), new_energy.tolist(), new_hunger.tolist(), new_thirst.tolist(), new_food.tolist(), new_water.tolist(),
+        )
+        for (
+            character,
+            sent, proba, gift_, weapon, happier, hype_,
+            health_, mental_, food_, water_,
+            evolves_, thirst_case_, hunger_case_, energy_case_, cause,
+            new_mental_, new_energy_, new_hunger_, new_thirst_, new_food_, new_water_,
+        ) in columns:
+
+            # Gift
+            if sent:
+                character.__receive_gift(proba, gift_, weapon, happier)
+            character.hype = hype_
+            character.health = health_
+            character.mental = mental_
+            character.bag.food = food_
+            character.bag.water = water_
+
+            # Last character alive
+            if not evolves_:
+                continue
+
+            # Vitals
+            character.thirst = new_thirst_
+            character.hunger = new_hunger_
+            character.energy = new_energy_
+            character.mental = new_mental_
+            character.bag.food = new_food_
+            character.bag.water = new_water_
+            character.__report_evolution(time, thirst_case_, hunger_case_, energy_case_, cause)
+            if cause:
+                continue
+
+            # Clears the number of spotted characters and reset action
+            character.current_spotted_characters = 0
+            character.__current_action = "none"
+
+
+    def __receive_gift(self, proba: float, gift: int, weapon_index: int, happier: bool) -> None:
+        """
+        Receive the outcome of a gift roll computed by `evolve` or
+        `evolve_all`: -1 if the drone crashed, otherwise the index of the gift
+        (water, food, medecine, weapon). The values of the vitals are written
+        by the caller, this method only gives the weapon, updates the
+        statistics and saves the messages.
+        """
+        self.__game.save_message("🎁🎉 An unknown sponsor sent a gift to {character}", fmt={"character": self.name}, channel="public")
+        self.__game.save_message("🎁🎉 An unknown sponsor sent a gift to {character} (proba = {proba:.0%})", fmt={"character": self.name, "proba": proba}, channel="debug")
+
+        # If the drone crashed
+        if gift == -1:
+            self.__game.save_message("🎁❌ The drone sending your gift crashed in a tree and has been destroyed", channel=self.name)
+            self.__game.save_message("🎁❌ The gift for {character} could not be delivered", fmt={"character": self.name}, channel="debug")
+            return
+
+        # Gift
+        if gift == 0:
+            self.__game.save_message("🎁💧 You received some water from an unknown sponsor", channel=self.name)
+            self.__game.save_message("🎁💧 {character} received {water} water from an unknown sponsor", fmt={"character": self.name, "water": GIFT_WATER}, channel="debug")
+        elif gift == 1:
+            self.__game.save_message("🎁🍒 You received some food from an unknown sponsor", channel=self.name)
+            self.__game.save_message("🎁🍒 {character} received {food} food from an unknown sponsor", fmt={"character": self.name, "food": GIFT_FOOD}, channel="debug")
+        elif gift == 2:
+            self.__game.save_message("🎁💊 You received some medecine from an unknown sponsor", channel=self.name)
+            self.__game.save_message("🎁💊 {character}'s health was restored by {health} thanks to medecine sent by the unknown sponsor", fmt={"character": self.name, "health": GIFT_HEALTH}, channel="debug")
+        elif gift == 3:
+            weapon = Weapon(name=WEAPONS[weapon_index][0], damage=WEAPONS[weapon_index][1])
+            self.bag.add_weapon(weapon)
+            self.__game.save_message("🎁🔪 You received {weapon} from an unknown sponsor", fmt={"weapon": weapon.name}, channel=self.name)
+            self.__game.save_message("🎁🔪 {character} received {weapon} from an unknown sponsor", fmt={"character": self.name, "weapon": weapon.name}, channel="debug")
+
+        # The gift also restores some mental
+        if happier:
+            self.__game.save_message("🎁❤️‍🩹 The gift made you feel a bit happier", channel=self.name)
+            self.__game.save_message("🎁❤️‍🩹 {character} feels a bit happier thanks to the gift", fmt={"character": self.name}, channel="debug")
+
+        # Update statistics
+        self.statistics["gifts_received"] += 1
+
+
+    def __report_evolution(
+        self,
+        time: Literal["day", "night"],
+        thirst_case: int,
+        hunger_case: int,
+        energy_case: int,
+        cause_of_death: str,
+    ) -> None:
+        """
+        Save the messages of the evolution computed by `evolve` or
+        `evolve_all`, and kill the character if needed. The cases are the ones
+        described in `evolve_all`.
+        """
+        game = self.__game
+
+        # Thirst
+        if thirst_case == 0:
+            game.save_message("💧✅ You drinked some water", channel=self.name)
+            game.save_message("💧✅ {character} drinks water ({water} left)", fmt={"character": self.name, "water": self.bag.water}, channel="debug")
+        elif thirst_case == 1:
+            game.save_message("💧❌ You are slightly thirsty", channel=self.name)
+        elif thirst_case == 2:
+            game.save_message("💧❌ You are thirsty", channel=self.name)
+            game.save_message("💧❌ {character} is thirsty and might die in {turns} turns", fmt={"character": self.name, "turns": self.thirst + 1}, channel="debug")
+        elif thirst_case == 3:
+            game.save_message("💧❌ You are deshydrated and will die next turn if you don't manage to find water", channel=self.name)
+            game.save_message("💧❌ {character} is deshydrated and might die next turn", fmt={"character": self.name}, channel="debug")
+        else:
+            self.alive = False
+            self.statistics["cause_of_death"] = "thirst"
+            game.save_message("💀💧 You died of thirst", channel=self.name)
+            game.save_message("💀💧 {character} died of thirst", fmt={"character": self.name}, channel="public", anti_channels=[self.name])
+            game.save_message("💀💧 {character} died of thirst", fmt={"character": self.name}, channel="debug")
+            if not game.headless:
+                for channel in [c.name for c in game.get_alive_characters()]:
+                    game.save_message("💀💀 A tribute has fallen", channel=channel)
+            return
+
+        # Hunger
+        if hunger_case == 0:
+            game.save_message("🍒✅ You ate some food", channel=self.name)
+            game.save_message("🍒✅ {character} ate food ({food} left)", fmt={"character": self.name, "food": self.bag.food}, channel="debug")
+        elif hunger_case == 1:
+            game.save_message("🍒❌ You are slightly hungry", channel=self.name)
+        elif hunger_case == 2:
+            game.save_message("🍒❌ You are hungry", channel=self.name)
+            game.save_message("🍒❌ {character} is hungry and might die in {turns} turns", fmt={"character": self.name, "turns": self.hunger + 1}, channel="debug")
+        elif hunger_case == 3:
+            game.save_message("🍒❌ You are starving and will die next turn if you don't manage to find food", channel=self.name)
+            game.save_message("🍒❌ {character} is starving and might die next turn", fmt={"character": self.name}, channel="debug")
+        else:
+            self.alive = False
+            self.statistics["cause_of_death"] = "hunger"
+            game.save_message("💀🍒 You died of hunger", channel=self.name)
+            game.save_message("💀🍒 {character} died of hunger", fmt={"character": self.name}, channel="public", anti_channels=[self.name])
+            game.save_message("💀🍒 {character} died of hunger", fmt={"character": self.name}, channel="debug")
+            if not game.headless:
+                for channel in [c.name for c in game.get_alive_characters()]:
+                    game.save_message("💀💀 A tribute has fallen", channel=channel)
+            return
+
+        # Energy
+        if energy_case == 0:
+            game.save_message("🛌✅ You have regained some energy", channel=self.name)
+            game.save_message("🛌✅ {character} has regained 1 energy", fmt={"character": self.name}, channel="debug")
+        elif energy_case == 1:
+            game.save_message("🛌❌ You are tired", channel=self.name)
+            game.save_message("🛌❌ {character} is tired ({energy} energy left)", fmt={"character": self.name, "energy": self.energy}, channel="debug")
+        elif energy_case == 2:
+            game.save_message("🛌❌ You are exhausted", channel=self.name)
+            game.save_message("🛌❌ {character} is exhausted ({energy} energy left)", fmt={"character": self.name, "energy": self.energy}, channel="debug")
+        elif energy_case == 3:
+            game.save_message("🛌❌ Your lack of sleep is driving you insane, and you should rest within {turns} turns", fmt={"turns": self.mental + 1}, channel=self.name)
+            game.save_message("🛌❌ {character}'s lack of sleep is driving them insane ({turns} turns before dying)", fmt={"character": self.name, "turns": self.mental + 1}, channel="debug")
+        elif energy_case == 4:
+            game.save_message("🛌❌ Your lack of sleep is driving you insane, and you should rest immediately", channel=self.name)
+            game.save_message("🛌❌ {character}'s lack of sleep is driving them insane (last turns before dying)", fmt={"character": self.name}, channel="debug")
+        elif energy_case == 5:
+            self.alive = False
+            self.statistics["cause_of_death"] = "madness"
+            game.save_message("💀🧠 You killed yourself", channel=self.name)
+            game.save_message("💀🧠 {character} killed themself", fmt={"character": self.name}, channel="public", anti_channels=[self.name])
+            game.save_message("💀🧠 {character} killed themself", fmt={"character": self.name}, channel="debug")
+            if not game.headless:
+                for channel in [c.name for c in game.get_alive_characters()]:
+                    game.save_message("💀💀 A tribute has fallen", channel=channel)
+            return
 
         # If a character has not moved for 3 turns, their position is revealed
-        if len(self.statistics["position_history"]) > 3 and TERRAIN_RADIUS > 0:
+        if not game.headless and len(self.statistics["position_history"]) > 3 and TERRAIN_RADIUS > 0:
             p_1 = self.statistics["position_history"][-1]
             p_2 = self.statistics["position_history"][-2]
             p_3 = self.statistics["position_history"][-3]
             if p_1 == p_2 == p_3:
-                self.__game.save_message("👀👀 {character} has been spotted at {coords}".format(character=self.name, coords=coords(p_1)), channel="public")
-                self.__game.save_message("👀👀 {character} has been spotted at {coords}".format(character=self.name, coords=coords(p_1)), channel="debug")
+                game.save_message("👀👀 {character} has been spotted at {coords}", fmt={"character": self.name, "coords": coords(p_1)}, channel="public")
+                game.save_message("👀👀 {character} has been spotted at {coords}", fmt={"character": self.name, "coords": coords(p_1)}, channel="debug")
 
         # If a character has no health, they die (this should not happen)
-        if self.health == 0 and self.alive:
+        if cause_of_death == "health":
             self.alive = False
             self.statistics["cause_of_death"] = "health"
-            self.__game.save_message("💀💀 You died", channel=self.name)
-            self.__game.save_message("💀💀 {character} died".format(character=self.name), channel="public", anti_channels=[self.name])
-            self.__game.save_message("💀💀 {character} died for unknown reasons".format(character=self.name), channel="debug")
-            return
-
-        # Clears the number of spotted characters
-        self.current_spotted_characters = 0
-
-        # Reset action (should be performed last)
-        self.__current_action = "none"
+            game.save_message("💀💀 You died", channel=self.name)
+            game.save_message("💀💀 {character} died", fmt={"character": self.name}, channel="public", anti_channels=[self.name])
+            game.save_message("💀💀 {character} died for unknown reasons", fmt={"character": self.name}, channel="debug")
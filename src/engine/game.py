@@ -1,29 +1,33 @@
-from typing import Literal
-import os
+from typing import Literal, Any
 import datetime
 import random
 import itertools
-import json
+import time
+import contextlib
 from .constants import *
 from .character import Character
 from .map import Map
 from .weapon import Weapon
+from .instrumentation import Instrumentation
+from .templates import get_template_table
 from ..shared.utils import *
 
 
-# Load 'sentences.json'
-CURRENT_DIRECTORY = os.path.dirname(__file__)
-SENTENCES_PATH = os.path.join(CURRENT_DIRECTORY, "sentences.json")
-SENTENCES = json.load(open(SENTENCES_PATH, "r", encoding="utf8"))
-
-
 class Game:
 
-    def __init__(self, character_names: list[str], map_name: str | None = None, headless: bool = False):
+    def __init__(
+        self,
+        character_names: list[str],
+        map_name: str | None = None,
+        headless: bool = False,
+        vectorized: bool = False,
+        instrumentation: Instrumentation | None = None,
+    ):
 
         self.id = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
         self.__characters = [Character(name) for name in character_names]
         self.day: int = 0
+        self.turn: int = 0
         self.time: Literal["day", "night"] = "day"
         self.__announced_dead_characters: list[Character] = []
         self.public_messages: list[str] = []
@@ -32,6 +36,13 @@ class Game:
         self.map_ = Map(which=map_name, radius=TERRAIN_RADIUS)
         self.phase: Literal["move", "act"] = "move"
         self.__headless = headless
+        self.__vectorized = vectorized
+        self.__rng = None
+        self.__eliminations: dict[str, dict[str, Any]] = {}
+        self.__fallbacks: list[dict[str, Any]] = []
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.games += 1
 
         # Fill the game field for every character
         for character in self.__characters:
@@ -58,6 +69,33 @@ class Game:
         return self.__characters
 
 
+    @property
+    def headless(self) -> bool:
+        return self.__headless
+
+
+    def __timed(self, name: str):
+        """
+        Returns a context manager recording the time spent in its body if the
+        game is instrumented (see `Instrumentation`), and doing nothing
+        otherwise.
+        """
+        if self.instrumentation is None:
+            return contextlib.nullcontext()
+        return self.instrumentation.timed(name)
+
+
+    def get_rng(self):
+        """
+        Returns the NumPy random generator used by the vectorized resolution
+        steps. It is seeded from the `random` module the first time it is
+        needed, so that seeding `random` is enough to reproduce a game.
+        """
+        if self.__rng is None:
+            self.__rng = numpy_rng()
+        return self.__rng
+
+
     def save_message(
         self,
         message: str,
@@ -67,17 +105,15 @@ class Game:
         fmt: dict[str, str] = {}
     ) -> None:
 
+        if self.instrumentation is not None:
+            self.instrumentation.count_message(message, channel, self.private_messages)
+
         if self.__headless:
             return
 
-        # Check if there is a key equal to the message. If so, return a random
-        # sentence from the list of sentences
-        if message in SENTENCES and len(SENTENCES[message]) > 0:
-            # message = random.choice(sentences[message] + [message])
-            message = random.choice(SENTENCES[message])
-
-        # Format the message
-        message = message.format(**fmt)
+        # Render the message from its template, i.e. a random sentence from
+        # its variants in 'sentences.json' (if any), filled with `fmt`
+        message = get_template_table().get(message).render(fmt)
 
         # If emphasis, put newline before and after
         if emphasis:
@@ -93,7 +129,7 @@ class Game:
 
         # If the message is something else, check if the channel is the name
         # of a character, and store it if so
-        if channel in [c.name for c in self.__characters]:
+        if channel in self.private_messages:
             self.private_messages[channel].append(message)
 
 
@@ -109,6 +145,8 @@ class Game:
 
 
     def get_state_of_game(self) -> dict[str, str]:
+        if self.instrumentation is not None:
+            start = time.perf_counter()
 
         # Ask the character what they want to do now
         for character in self.__characters:
@@ -196,6 +234,8 @@ class Game:
             self.private_messages[name] = []
 
         # Return state
+        if self.instrumentation is not None:
+            self.instrumentation.add_duration("get_state_of_game", time.perf_counter() - start)
         return state
 
 
@@ -215,7 +255,8 @@ class Game:
                 self.save_message("🩸🩸 The bloodbath has begun", channel=channel, emphasis=True)
 
             # Resolve the first turn
-            self.__resolve_first_turn()
+            with self.__timed("resolve_first_turn"):
+                self.__resolve_first_turn()
 
             # Pass time manually
             self.day = 1
@@ -227,7 +268,8 @@ class Game:
             self.__show_time_and_day()
 
             # Resolve movements
-            self.__resolve_movements()
+            with self.__timed("resolve_movements"):
+                self.__resolve_movements()
 
             # Update the game phase
             self.phase = "act"
@@ -238,26 +280,38 @@ class Game:
             # Show time
             self.__show_time_and_day()
 
+            # Choose how to resolve the actions
+            if self.__vectorized:
+                resolve_actions = self.__resolve_actions_vectorized
+            else:
+                resolve_actions = self.__resolve_actions
+
             if self.time == "night" and random_bool(EVENT_PROBABILITY):
 
                 # Resolve hazard
-                hazard_region = self.__get_lowest_hype_region(width=EVENT_REGION_WIDTH)
+                with self.__timed("get_lowest_hype_region"):
+                    hazard_region = self.__get_lowest_hype_region(width=EVENT_REGION_WIDTH)
 
                 if hazard_region is not None:
                     characters_in_hazard_region = self.__get_characters_in_region(region=hazard_region, width=EVENT_REGION_WIDTH)
                     characters_outside_hazard_region = [c for c in self.get_alive_characters() if c not in characters_in_hazard_region]
-                    self.__resolve_actions(characters_subset=characters_outside_hazard_region)
-                    self.__resolve_hazard(hazard_region=hazard_region)
+                    with self.__timed("resolve_actions"):
+                        resolve_actions(characters_subset=characters_outside_hazard_region)
+                    with self.__timed("resolve_hazard"):
+                        self.__resolve_hazard(hazard_region=hazard_region)
                 else:
-                    self.__resolve_actions()
+                    with self.__timed("resolve_actions"):
+                        resolve_actions()
 
             else:
 
                 # Resolve actions
-                self.__resolve_actions()
+                with self.__timed("resolve_actions"):
+                    resolve_actions()
 
             # Pass time
-            self.__pass_time()
+            with self.__timed("pass_time"):
+                self.__pass_time()
 
             # Update the game phase
             self.phase = "move"
@@ -271,6 +325,67 @@ class Game:
                 emphasis=True,
             )
 
+        # Record the characters that died during this turn
+        self.__record_eliminations()
+        self.turn += 1
+
+
+    def __record_eliminations(self) -> None:
+        """
+        Record the placement of the characters that died during the current
+        turn, at the moment they die: they share the rank that follows the
+        characters still alive.
+        """
+        alive_count = len(self.get_alive_characters(as_list=True))
+        for character in self.__characters:
+            if not character.alive and character.name not in self.__eliminations:
+                self.__eliminations[character.name] = {
+                    "rank": alive_count + 1,
+                    "turns": self.turn + 1,
+                    "cause_of_death": character.statistics["cause_of_death"],
+                }
+
+
+    def record_fallback(self, name: str, reason: Literal["timeout", "error", "busy"]) -> None:
+        """
+        Record that a character was given a fallback action during the current
+        turn, because their agent did not decide in time, failed, or was still
+        busy with a decision that did not end in time.
+        """
+        self.__fallbacks.append({"character_name": name, "turn": self.turn, "reason": reason})
+
+
+    def get_summary(self) -> dict[str, Any]:
+        """
+        Returns a compact summary of the game, with the placement of every
+        character, sorted by rank: their final rank (1 for the winner, the
+        characters who died during the same turn sharing the same rank), the
+        number of turns they were alive for, their cause of death and their
+        number of kills. The fallback actions given to characters whose agent
+        did not decide in time or failed are also listed.
+        """
+        placements = []
+        for character in self.__characters:
+            elimination = self.__eliminations.get(character.name, {
+                "rank": 1,
+                "turns": self.turn + 1,
+                "cause_of_death": character.statistics["cause_of_death"],
+            })
+            placements.append({
+                "character_name": character.name,
+                **elimination,
+                "kills": character.statistics["kills"],
+            })
+        placements.sort(key=lambda placement: placement["rank"])
+        return {
+            "id": self.id,
+            "map_name": self.map_.name,
+            "turns": self.turn,
+            "winners": [c.name for c in self.get_alive_characters()],
+            "placements": placements,
+            "fallbacks": self.__fallbacks,
+        }
+
 
     def __get_characters_in_cell(self, position: tuple[int, int]) -> list[Character]:
         characters = [character for character in self.__characters if (character.position == position and character.alive)]
@@ -613,68 +728,203 @@ class Game:
 
             # End with hunts: resolve attacks
             for attacker, attacked in attacks.items():
+                self.__resolve_attack(attacker, attacked)
 
-                # Check that both characters are still alive
-                if attacker.alive and attacked.alive:
+            # If character had originally chosen to rest but was attacked, they
+            # will not be able to rest
+            self.__report_interrupted_rests(characters_in_the_cell, attacks)
 
-                    # Check for probability of success
-                    success_proba = HUNT_SUCCESS_PROBABILITY
-                    if self.time == "night":
-                        success_proba *= NIGHT_PROBABILITY_FACTOR
 
-                    # Attack if everything is fine
-                    if random_bool(success_proba):
-                        attacker.attack(attacked)
+    def __resolve_actions_vectorized(self, characters_subset: list[Character] | None = None) -> None:
+        """
+        Same as `__resolve_actions`, but characters are grouped by cell and by
+        action, and all the dice (gather, hide, hunt targets and hunt
+        successes) are rolled at once with NumPy, so that the resolution scales
+        with the number of characters rather than with its square per cell.
+
+        Finding a target while hunting is drawn in a single roll: since each of
+        the `k` potential victims is detected independently with the same
+        probability `p`, somebody is found with probability `1 - (1 - p)**k`,
+        and the victim is then uniformly chosen among the `k` potential victims.
+        """
+        import numpy as np  # only for the vectorized resolution
 
-                    # If the attack failed
-                    else:
-                        self.save_message(
-                            "🔪❌ You tried to attack {attacked}, but they escaped your assault",
-                            fmt={"attacked": attacked.name},
-                            channel=attacker.name,
-                        )
-                        self.save_message(
-                            "🔪❌ {attacker} tried to attack you, but you barely escaped",
-                            fmt={"attacker": attacker.name},
-                            channel=attacked.name,
-                        )
-                        self.save_message(
-                            "🔪❌ {attacker} tried to attack {attacked}, but they escaped",
-                            fmt={"attacker": attacker.name, "attacked": attacked.name},
-                            channel="debug",
-                        )
+        rng = self.get_rng()
+
+        # Get all characters that have to act
+        if characters_subset is None:
+            characters = self.get_alive_characters(as_list=True)
+        else:
+            characters = [c for c in characters_subset if c.alive]
+        n = len(characters)
+        if n == 0:
+            return
 
-                # If one of the characters is dead during the resolve, skip.
-                # More precisely: if the attacked died (and thus if the
-                # attacker is still alive), simply state that nobody was found.
-                elif attacker.alive:
+        # Shuffle the cells, and the characters within each cell
+        cells = list(itertools.product(range(-TERRAIN_RADIUS, TERRAIN_RADIUS + 1), repeat=2))
+        cells = [cells[i] for i in rng.permutation(len(cells)).tolist()]
+        cells_ranks = {cell: rank for rank, cell in enumerate(cells)}
+        cells_ranks = np.array([cells_ranks[c.position] for c in characters])
+        order = np.lexsort((rng.random(n), cells_ranks))
+        characters = [characters[i] for i in order.tolist()]
+        cells_ranks = cells_ranks[order]
+        actions = [c.get_action() for c in characters]
+
+        # Hunts: count the potential victims (i.e. characters that do not hide)
+        # of each cell, and get the position of each of them in their cell
+        is_visible = np.array([action != "hide" for action in actions])
+        visible_indices = np.flatnonzero(is_visible)
+        visible_count = np.bincount(cells_ranks[is_visible], minlength=len(cells))
+        visible_start = np.concatenate(([0], np.cumsum(visible_count)[:-1]))
+        visible_position = np.zeros(n, dtype=int)
+        visible_position[visible_indices] = np.arange(len(visible_indices)) - visible_start[cells_ranks[is_visible]]
+
+        # Hunts: roll the dice of every hunter at once. Hunters are visible
+        # themselves, so they are not counted as their own potential victim.
+        hunters = np.array([i for i, action in enumerate(actions) if action == "hunt"], dtype=int)
+        hunters_cells = cells_ranks[hunters]
+        visibility = np.array([self.map_.cells[cell].visibility_proba for cell in cells])
+        potential_victims_count = visible_count[hunters_cells] - 1
+        found = rng.random(len(hunters)) < 1 - (1 - visibility[hunters_cells]) ** potential_victims_count
+        victim_position = (rng.random(len(hunters)) * potential_victims_count).astype(int)
+        victim_position += victim_position >= visible_position[hunters]
+        victims = visible_indices[np.where(found, visible_start[hunters_cells] + victim_position, 0)]
+        success_proba = HUNT_SUCCESS_PROBABILITY
+        if self.time == "night":
+            success_proba *= NIGHT_PROBABILITY_FACTOR
+        successes = rng.random(len(hunters)) < success_proba
+        targets = {
+            hunter: (victim if found_ else None, success)
+            for hunter, victim, found_, success in zip(hunters.tolist(), victims.tolist(), found.tolist(), successes.tolist())
+        }
+
+        # Gather and hide: roll the dice of every character at once
+        gathering = [i for i, action in enumerate(actions) if action == "gather"]
+        hiding = [i for i, action in enumerate(actions) if action == "hide"]
+        outcomes = {
+            **dict(zip(gathering, Character.draw_gather_outcomes([characters[i] for i in gathering]))),
+            **dict(zip(hiding, Character.draw_hide_outcomes([characters[i] for i in hiding]))),
+        }
+
+        # Resolve each cell, in order
+        boundaries = np.flatnonzero(np.diff(cells_ranks)) + 1
+        for start, end in zip([0] + boundaries.tolist(), boundaries.tolist() + [n]):
+            characters_in_the_cell = characters[start:end]
+
+            # Define the battles
+            attacks: dict[Character, Character] = {}
+            attacks_successes: dict[Character, bool] = {}
+            for i in range(start, end):
+                if actions[i] != "hunt":
+                    continue
+                attacker = characters[i]
+                victim, success = targets[i]
+                if victim is not None:
+                    attacks[attacker] = characters[victim]
+                    attacks_successes[attacker] = success
+                else:
                     self.save_message(
                         "🔪❌ You found nobody nearby",
                         channel=attacker.name,
                     )
                     self.save_message(
-                        "🔪❌ {attacker} wanted to attack {attacked}, but they died in the meantime",
-                        fmt={"attacker": attacker.name, "attacked": attacked.name},
+                        "🔪❌ {attacker} found no one to attack",
+                        fmt={"attacker": attacker.name},
                         channel="debug",
                     )
+            attacked_characters = set(attacks.values())
 
-                # If the attacker died, simply skip.
-                else:
-                    pass
+            # Start with non hunting characters
+            for i in range(start, end):
+                if actions[i] == "gather":
+                    characters[i].gather(outcomes[i])
+                elif actions[i] == "hide":
+                    characters[i].hide(outcomes[i])
+                elif actions[i] == "rest" and characters[i] not in attacked_characters:
+                    characters[i].rest()
+
+            # End with hunts: resolve attacks
+            for attacker, attacked in attacks.items():
+                self.__resolve_attack(attacker, attacked, success=attacks_successes[attacker])
 
             # If character had originally chosen to rest but was attacked, they
             # will not be able to rest
-            for attacked in characters_in_the_cell:
-                if attacked.get_action() == "rest" and attacked in attacks.values() and attacked.alive:
-                    self.save_message(
-                        "🛌🔪 Because of the assault, you couldn't get a wink of sleep",
-                        channel=attacked.name,
-                    )
-                    self.save_message(
-                        "🛌🔪 {attacked} couldn't rest because of the assault",
-                        fmt={"attacked": attacked.name},
-                        channel="debug",
-                    )
+            self.__report_interrupted_rests(characters_in_the_cell, attacks)
+
+
+    def __resolve_attack(self, attacker: Character, attacked: Character, success: bool | None = None) -> None:
+        """
+        Resolve an attack decided during `__resolve_actions`. If `success` is
+        not given, the success of the attack is drawn here.
+        """
+        # Check that both characters are still alive
+        if attacker.alive and attacked.alive:
+
+            # Check for probability of success
+            if success is None:
+                success_proba = HUNT_SUCCESS_PROBABILITY
+                if self.time == "night":
+                    success_proba *= NIGHT_PROBABILITY_FACTOR
+                success = random_bool(success_proba)
+
+            # Attack if everything is fine
+            if success:
+                attacker.attack(attacked)
+
+            # If the attack failed
+            else:
+                self.save_message(
+                    "🔪❌ You tried to attack {attacked}, but they escaped your assault",
+                    fmt={"attacked": attacked.name},
+                    channel=attacker.name,
+                )
+                self.save_message(
+                    "🔪❌ {attacker} tried to attack you, but you barely escaped",
+                    fmt={"attacker": attacker.name},
+                    channel=attacked.name,
+                )
+                self.save_message(
+                    "🔪❌ {attacker} tried to attack {attacked}, but they escaped",
+                    fmt={"attacker": attacker.name, "attacked": attacked.name},
+                    channel="debug",
+                )
+
+        # If one of the characters is dead during the resolve, skip.
+        # More precisely: if the attacked died (and thus if the
+        # attacker is still alive), simply state that nobody was found.
+        elif attacker.alive:
+            self.save_message(
+                "🔪❌ You found nobody nearby",
+                channel=attacker.name,
+            )
+            self.save_message(
+                "🔪❌ {attacker} wanted to attack {attacked}, but they died in the meantime",
+                fmt={"attacker": attacker.name, "attacked": attacked.name},
+                channel="debug",
+            )
+
+        # If the attacker died, simply skip.
+        else:
+            pass
+
+
+    def __report_interrupted_rests(self, characters_in_the_cell: list[Character], attacks: dict[Character, Character]) -> None:
+        """
+        Inform the characters that had chosen to rest but were attacked that
+        they could not rest.
+        """
+        attacked_characters = set(attacks.values())
+        for attacked in characters_in_the_cell:
+            if attacked.get_action() == "rest" and attacked in attacked_characters and attacked.alive:
+                self.save_message(
+                    "🛌🔪 Because of the assault, you couldn't get a wink of sleep",
+                    channel=attacked.name,
+                )
+                self.save_message(
+                    "🛌🔪 {attacked} couldn't rest because of the assault",
+                    fmt={"attacked": attacked.name},
+                    channel="debug",
+                )
 
 
     def __resolve_hazard(self, hazard_region: Literal["north", "south", "east", "west"]) -> None:
@@ -817,8 +1067,11 @@ class Game:
             self.day += 1
 
         # Make characters evolve
-        for character in self.get_alive_characters():
-            character.evolve(self.time)
+        if self.__vectorized:
+            Character.evolve_all(self.get_alive_characters(as_list=True), self.time)
+        else:
+            for character in self.get_alive_characters():
+                character.evolve(self.time)
 
         if self.time == "day":
             self.time = "night"
@@ -0,0 +1,83 @@
+import time
+import contextlib
+from collections import Counter
+from typing import Any
+from ..shared import utils
+
+
+# Channel under which the messages sent to characters are counted
+CHARACTER_CHANNEL = "<character>"
+
+
+class Instrumentation:
+    """
+    Records the time spent in each phase of the games it is given to (see
+    the `instrumentation` argument of `Game`), and counts the calls to
+    `Game.save_message` per template and channel (all the characters' own
+    channels being counted as `CHARACTER_CHANNEL`). Give the same instance to
+    many games to aggregate a whole batch, or `merge` the instances of games
+    played in other processes.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.durations: dict[str, list[float]] = {}
+        self.messages: Counter = Counter()
+
+
+    @contextlib.contextmanager
+    def timed(self, name: str):
+        """
+        Context manager recording the time spent in its body under `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_duration(name, time.perf_counter() - start)
+
+
+    def add_duration(self, name: str, duration: float) -> None:
+        self.durations.setdefault(name, []).append(duration)
+
+
+    def count_message(self, template: str, channel: str, characters: set[str] | dict) -> None:
+        self.messages[(template, CHARACTER_CHANNEL if channel in characters else channel)] += 1
+
+
+    def merge(self, other: "Instrumentation") -> "Instrumentation":
+        """
+        Add the measures of another instance to this one, and return it.
+        """
+        self.games += other.games
+        for name, durations in other.durations.items():
+            self.durations.setdefault(name, []).extend(durations)
+        self.messages.update(other.messages)
+        return self
+
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns the aggregated measures: for each phase, the number of calls,
+        the total time (in seconds) and the mean and percentiles of a call (in
+        milliseconds), and the number of calls to `save_message` per template
+        and channel, most frequent first.
+        """
+        phases = {}
+        for name, durations in self.durations.items():
+            phases[name] = {
+                "calls": len(durations),
+                "total_s": sum(durations),
+                "mean_ms": 1000 * sum(durations) / len(durations),
+                **{f"{key}_ms": 1000 * value for key, value in utils.percentiles(durations).items()},
+                "max_ms": 1000 * max(durations),
+            }
+        messages = [
+            {"template": template, "channel": channel, "calls": calls}
+            for (template, channel), calls in self.messages.most_common()
+        ]
+        return {
+            "games": self.games,
+            "phases": phases,
+            "messages": messages,
+        }
@@ -14,6 +14,7 @@ class Map:
 
         if which is None:
             which = random.choice(["forest", "jungle", "ruins", "colosseum"])
+        self.name = which
 
         cornucopia = Cell(
             "at|the cornucopia",
@@ -0,0 +1,108 @@
+import os
+import json
+import random
+import hashlib
+import functools
+from string import Formatter
+from typing import Any, Callable
+
+
+# Path of 'sentences.json'
+CURRENT_DIRECTORY = os.path.dirname(__file__)
+SENTENCES_PATH = os.path.join(CURRENT_DIRECTORY, "sentences.json")
+
+# A pre-parsed variant: its final text if it has no fields, its pieces
+# (literal text, field name or None) if all its fields are plain names, or its
+# `format_map` method if it needs the full formatting machinery
+Variant = str | tuple[tuple[str, str | None], ...] | Callable[[dict[str, Any]], str]
+
+
+@functools.lru_cache(maxsize=None)
+def get_sentences() -> dict[str, list[str]]:
+    """
+    Returns the variants of each message, loaded from 'sentences.json' the
+    first time they are needed (headless games never need them).
+    """
+    with open(SENTENCES_PATH, "r", encoding="utf8") as f:
+        return json.load(f)
+
+
+def compile_variant(text: str) -> Variant:
+    """
+    Pre-parse a variant of a template (see `Variant`).
+    """
+    pieces = list(Formatter().parse(text))
+    if all(field is None for _, field, _, _ in pieces):
+        return "".join(literal for literal, _, _, _ in pieces)
+    if all(field is None or (field.isidentifier() and not spec and conversion is None) for _, field, spec, conversion in pieces):
+        return tuple((literal, field) for literal, field, _, _ in pieces)
+    return text.format_map
+
+
+class Template:
+    """
+    A message template, with a stable id (a hash of its text), its fields, and
+    its pre-parsed variants (those of 'sentences.json', or the template itself
+    if it has none).
+    """
+
+    __slots__ = ["id", "text", "fields", "variants", "has_variants"]
+
+    def __init__(self, text: str, variants: list[str]):
+        self.id = hashlib.sha1(text.encode("utf8")).hexdigest()[:12]
+        self.text = text
+        self.has_variants = len(variants) > 0
+        self.fields = frozenset(
+            field
+            for variant in (variants if self.has_variants else [text])
+            for _, field, _, _ in Formatter().parse(variant)
+            if field is not None
+        )
+        self.variants: tuple[Variant, ...] = tuple(compile_variant(variant) for variant in (variants if self.has_variants else [text]))
+
+
+    def render(self, fmt: dict[str, Any]) -> str:
+        """
+        Returns the message, from a random variant if the template has some,
+        filled with the values of `fmt`.
+        """
+        variant = random.choice(self.variants) if self.has_variants else self.variants[0]
+        if type(variant) is str:
+            return variant
+        if type(variant) is tuple:
+            return "".join([literal if field is None else literal + str(fmt[field]) for literal, field in variant])
+        return variant(fmt)
+
+
+class TemplateTable:
+    """
+    Table of the templates of the messages, indexed by text and by id. The
+    templates of 'sentences.json' are compiled upfront, and those written in
+    the engine the first time they are used.
+    """
+
+    def __init__(self, sentences: dict[str, list[str]]):
+        self.sentences = sentences
+        self.templates: dict[str, Template] = {}
+        self.ids: dict[str, Template] = {}
+        for text in sentences:
+            self.get(text)
+
+
+    def get(self, text: str) -> Template:
+        """
+        Returns the template of a message, compiling it if needed.
+        """
+        template = self.templates.get(text)
+        if template is None:
+            template = self.templates[text] = Template(text, self.sentences.get(text, []))
+            self.ids[template.id] = template
+        return template
+
+
+@functools.lru_cache(maxsize=None)
+def get_template_table() -> TemplateTable:
+    """
+    Returns the table of templates, built the first time it is needed.
+    """
+    return TemplateTable(get_sentences())
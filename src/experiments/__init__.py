@@ -0,0 +1,17 @@
+from .cache import ResultCache
+from .dataset import LogDataset
+from .evolution import evolve
+from .store import ResultStore
+from .sweep import sweep, grid, random_samples
+from .tournament import tournament
+
+__all__ = [
+    "ResultCache",
+    "LogDataset",
+    "evolve",
+    "ResultStore",
+    "sweep",
+    "grid",
+    "random_samples",
+    "tournament",
+]
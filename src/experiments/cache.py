@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import glob
+import hashlib
+import tempfile
+import functools
+from typing import TYPE_CHECKING, Any
+from ..api import api
+from ..agents import BaseAgent
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Directory of the sources, and the files defining the rules of the game: the
+# engine, and the game loop with the helpers it uses to play a game and to
+# build what the agents see
+SOURCE_DIRECTORY = os.path.dirname(os.path.dirname(__file__))
+RULES_PATTERNS = ["engine/*.py", "engine/*.json", "api.py", "shared/utils.py", "shared/delta.py"]
+
+
+def __hash_files(paths: list[str]) -> str:
+    """
+    Returns a hash of the content of the given files (and of their paths
+    within the sources).
+    """
+    hash_object = hashlib.sha256()
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            hash_object.update(os.path.relpath(path, SOURCE_DIRECTORY).replace(os.sep, "/").encode() + b"\0" + f.read() + b"\0")
+    return hash_object.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def rules_version() -> str:
+    """
+    Returns a version of the rules of the game, i.e. a hash of the source
+    files of `RULES_PATTERNS`, so that cached results are invalidated as soon
+    as the engine or the game loop changes.
+    """
+    paths = [path for pattern in RULES_PATTERNS for path in glob.glob(os.path.join(SOURCE_DIRECTORY, pattern))]
+    return __hash_files(paths)
+
+
+@functools.lru_cache(maxsize=None)
+def agent_version(agent_class: type[BaseAgent]) -> str:
+    """
+    Returns a version of the behaviour of an agent class, i.e. a hash of the
+    source files of the class and its parents.
+    """
+    paths = set()
+    for cls in agent_class.__mro__:
+        path = getattr(sys.modules.get(cls.__module__), "__file__", None)
+        if path is not None and cls is not object:
+            paths.add(path)
+    return __hash_files(list(paths))
+
+
+class ResultCache:
+    """
+    Content-addressed cache of game results on disk. A game is identified by
+    a hash of the configurations of its agents (see `BaseAgent.get_config`),
+    its seed, its map and its options, along with the versions of the rules
+    and of the agents, so that changing the engine or an agent invalidates its
+    results. Each result is stored in its own file, written atomically, so
+    that many processes can share the same cache.
+    """
+
+    def __init__(self, directory: str = "cache"):
+        self.directory = directory
+
+
+    def key(self, agents: list[BaseAgent], seed: int, map_name: str | None = None, **options: Any) -> str:
+        """
+        Returns the key of a game.
+        """
+        description = {
+            "rules_version": rules_version(),
+            "agents": [
+                {"config": agent.get_config(), "version": agent_version(type(agent))}
+                for agent in agents
+            ],
+            "seed": seed,
+            "map_name": map_name,
+            "options": options,
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """
+        Returns the result stored for a key, or None if there is none.
+        """
+        try:
+            with open(self.__path(key), "r", encoding="utf8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        """
+        Store the result of a game. The file is written under a temporary name
+        and then renamed, so that readers never see a partial file and
+        concurrent writers of the same key simply replace each other.
+        """
+        path = self.__path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf8") as f:
+                json.dump(result, f)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+
+def get_leaderboard(
+    agents: list[BaseAgent],
+    seed: int,
+    map_name: str | None = None,
+    vectorized: bool = False,
+    cache: ResultCache | None = None,
+) -> "pd.DataFrame":
+    """
+    Play a game with the given seed and return its leaderboard (see `api`),
+    with the rank, number of turns survived, cause of death and kills of each
+    character. If a cache is given, the leaderboard is taken from it when the
+    same game has already been played, and stored in it otherwise.
+    """
+    import pandas as pd
+
+    # Check the cache
+    if cache is not None:
+        key = cache.key(agents, seed, map_name, vectorized=vectorized)
+        result = cache.get(key)
+        if result is not None:
+            return pd.DataFrame(result["leaderboard"])
+
+    # Play the game
+    leaderboard = api(agents, map_name=map_name, return_leaderboard=True, vectorized=vectorized, seed=seed)["leaderboard"]
+
+    # Save and return
+    if cache is not None:
+        cache.put(key, {"leaderboard": leaderboard.to_dict(orient="list")})
+    return leaderboard
@@ -0,0 +1,225 @@
+import os
+import glob
+import json
+import shutil
+import tempfile
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+from ..shared.logs import EXTENSIONS, open_log
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+# Name of the directory, next to the logs, holding their columnar copies
+COLUMNS_DIRECTORY = ".columns"
+
+# Columns read as strings whatever their content (e.g. numeric names)
+STRING_COLUMNS = ["game_id", "character_name"]
+
+
+def log_version(path: str) -> dict[str, int]:
+    """
+    Returns the version of a log, i.e. its size and modification time.
+    """
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def __read_tsv(path: str) -> "pd.DataFrame":
+    """
+    Read a TSV log with a stable schema across games: empty cells are kept as
+    empty strings, and `STRING_COLUMNS` are always strings.
+    """
+    import pandas as pd
+    with open_log(path) as f:
+        return pd.read_csv(f, sep="\t", keep_default_na=False, dtype={column: str for column in STRING_COLUMNS})
+
+
+def __to_array(column: "pd.Series") -> "np.ndarray":
+    """
+    Returns a column as a memory-mappable array, i.e. with fixed-width
+    strings instead of Python objects.
+    """
+    if column.dtype.kind in "biuf":
+        return column.to_numpy()
+    return column.astype(str).to_numpy(dtype=str)
+
+
+def convert_log(path: str, directory: str) -> dict[str, Any]:
+    """
+    Convert a TSV log (see `api`'s `save_tsv`, compressed or not) to a
+    directory with one `.npy` file per column, and a `meta.json` file with the
+    number of rows, the game id, the range of days and the characters of the
+    game. The directory is written under a temporary name and then renamed,
+    so that readers never see a partial conversion. Returns the metadata.
+    """
+    import numpy as np
+    df = __read_tsv(path)
+    meta = {
+        "source": log_version(path),
+        "rows": len(df),
+        "columns": list(df.columns),
+        "game_ids": sorted(df["game_id"].unique().tolist()) if "game_id" in df else [],
+        "days": [int(df["game_state_day"].min()), int(df["game_state_day"].max())] if "game_state_day" in df and len(df) else None,
+        "characters": sorted(df["character_name"].unique().tolist()) if "character_name" in df else [],
+    }
+    os.makedirs(os.path.dirname(directory), exist_ok=True)
+    temporary_directory = tempfile.mkdtemp(dir=os.path.dirname(directory), suffix=".tmp")
+    try:
+        for i, column in enumerate(meta["columns"]):
+            np.save(os.path.join(temporary_directory, f"{i}.npy"), __to_array(df[column]))
+        with open(os.path.join(temporary_directory, "meta.json"), "w", encoding="utf8") as f:
+            json.dump(meta, f)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(temporary_directory, directory)
+    except OSError:
+        # Another process converted the same log at the same time
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            raise
+    return meta
+
+
+class LogDataset:
+    """
+    A directory of TSV logs (see `api`'s `save_tsv`, compressed or not) opened
+    as a single dataset, without reading them all in memory. Each log is
+    converted once to a columnar copy (see `convert_log`), kept in the
+    `COLUMNS_DIRECTORY` of the logs and refreshed when the log changes, whose
+    columns are then memory-mapped. Selecting a few columns, games, days or
+    characters only reads what is needed, and whole games are skipped from
+    their metadata alone:
+
+        dataset = LogDataset("logs")
+        df = dataset.load(columns=["character_state_health"], days=range(3), characters=["Katniss"])
+    """
+
+    def __init__(self, directory: str = "logs", columns_directory: str | None = None, verbose: bool = False):
+        self.directory = directory
+        self.columns_directory = columns_directory if columns_directory is not None else os.path.join(directory, COLUMNS_DIRECTORY)
+        self.paths = sorted(
+            path
+            for extension in EXTENSIONS.values()
+            for path in glob.glob(os.path.join(directory, f"*.tsv{extension}"))
+        )
+        self.metas: list[dict[str, Any]] = []
+        for i, path in enumerate(self.paths):
+            self.metas.append(self.__meta(path))
+            if verbose:
+                print(f"\r{i + 1}/{len(self.paths)} logs opened", end="", flush=True)
+        if verbose:
+            print()
+
+
+    def __columns_path(self, path: str) -> str:
+        return os.path.join(self.columns_directory, os.path.basename(path))
+
+
+    def __meta(self, path: str) -> dict[str, Any]:
+        """
+        Returns the metadata of the columnar copy of a log, converting it first
+        if it is missing or out of date.
+        """
+        try:
+            with open(os.path.join(self.__columns_path(path), "meta.json"), "r", encoding="utf8") as f:
+                meta = json.load(f)
+            if meta["source"] == log_version(path):
+                return meta
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+        return convert_log(path, self.__columns_path(path))
+
+
+    @property
+    def columns(self) -> list[str]:
+        return list(dict.fromkeys(column for meta in self.metas for column in meta["columns"]))
+
+
+    @property
+    def game_ids(self) -> list[str]:
+        return [game_id for meta in self.metas for game_id in meta["game_ids"]]
+
+
+    def __len__(self) -> int:
+        return sum(meta["rows"] for meta in self.metas)
+
+
+    def column(self, index: int, name: str) -> "np.ndarray":
+        """
+        Returns a column of the `index`-th log, memory-mapped.
+        """
+        import numpy as np
+        meta = self.metas[index]
+        return np.load(os.path.join(self.__columns_path(self.paths[index]), f"{meta['columns'].index(name)}.npy"), mmap_mode="r")
+
+
+    def iter_games(
+        self,
+        columns: list[str] | None = None,
+        game_ids: Iterable[str] | None = None,
+        days: Iterable[int] | None = None,
+        characters: Iterable[str] | None = None,
+    ) -> Iterator["pd.DataFrame"]:
+        """
+        Yields the selected columns (all by default) of the rows matching the
+        filters, one log at a time. Logs whose games, days or characters do
+        not match the filters are skipped without being read. Columns missing
+        from some logs (e.g. older ones) are filled with None in those logs,
+        and columns missing from all of them raise a KeyError.
+        """
+        import numpy as np
+        import pandas as pd
+        if columns is not None:
+            known_columns = set(self.columns)
+            unknown_columns = [name for name in columns if name not in known_columns]
+            if unknown_columns:
+                raise KeyError(f"Unknown columns: {unknown_columns}")
+        game_ids = set(map(str, game_ids)) if game_ids is not None else None
+        days = sorted(set(days)) if days is not None else None
+        characters = set(map(str, characters)) if characters is not None else None
+        for index, meta in enumerate(self.metas):
+
+            # Skip the logs from their metadata
+            if meta["rows"] == 0:
+                continue
+            if game_ids is not None and game_ids.isdisjoint(meta["game_ids"]):
+                continue
+            if days is not None and (meta["days"] is None or not any(meta["days"][0] <= day <= meta["days"][1] for day in days)):
+                continue
+            if characters is not None and characters.isdisjoint(meta["characters"]):
+                continue
+
+            # Select the rows
+            mask = None
+            for name, values in [("game_id", game_ids), ("game_state_day", days), ("character_name", characters)]:
+                if values is not None and not (name == "game_id" and len(meta["game_ids"]) == 1):
+                    column_mask = np.isin(self.column(index, name), list(values))
+                    mask = column_mask if mask is None else mask & column_mask
+            if mask is not None and not mask.any():
+                continue
+
+            # Read the selected columns of the selected rows
+            selected_columns = columns if columns is not None else meta["columns"]
+            yield pd.DataFrame({
+                name: (self.column(index, name)[mask] if mask is not None else np.array(self.column(index, name)))
+                if name in meta["columns"] else np.full(meta["rows"] if mask is None else int(mask.sum()), None)
+                for name in selected_columns
+            })
+
+
+    def load(
+        self,
+        columns: list[str] | None = None,
+        game_ids: Iterable[str] | None = None,
+        days: Iterable[int] | None = None,
+        characters: Iterable[str] | None = None,
+    ) -> "pd.DataFrame":
+        """
+        Returns the selected columns (all by default) of the rows matching the
+        filters, from all the logs, as a single DataFrame (see `iter_games`).
+        """
+        import pandas as pd
+        frames = list(self.iter_games(columns=columns, game_ids=game_ids, days=days, characters=characters))
+        if not frames:
+            return pd.DataFrame(columns=columns if columns is not None else self.columns)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,206 @@
+import os
+import glob
+import random
+from typing import TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor
+from ..shared import utils
+from .cache import ResultCache, get_leaderboard
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Shape of the matrix of a single `MatrixAgent`
+MATRIX_SHAPE = (11, 5)
+
+
+def play_game(
+    matrices: "np.ndarray",
+    seed: int,
+    vectorized: bool = False,
+    cache: ResultCache | None = None,
+) -> list[int]:
+    """
+    Play a single game between `MatrixAgent`s with the given matrices (an
+    array of shape `(N, 11, 5)`), and return the final rank of each of them.
+    The game is reproducible from its seed, and taken from the cache if it has
+    already been played.
+    """
+    from ..agents import MatrixAgent
+    agents = MatrixAgent.from_population(matrices)
+    leaderboard = get_leaderboard(agents, seed, vectorized=vectorized, cache=cache)
+    ranks = dict(zip(leaderboard["character_name"], leaderboard["rank"]))
+    return [int(ranks[agent.name]) for agent in agents]
+
+
+def evaluate(
+    population: "np.ndarray",
+    rng: "np.random.Generator",
+    game_size: int = 24,
+    games_per_candidate: int = 4,
+    executor: ProcessPoolExecutor | None = None,
+    vectorized: bool = False,
+    cache: ResultCache | None = None,
+) -> "np.ndarray":
+    """
+    Compute the fitness of each candidate of a population, i.e. its mean
+    survival score over `games_per_candidate` games against other candidates
+    (1 for the winner, 0 for the first to die). Each round, the population is
+    shuffled and split into games of `game_size` candidates. Games are played
+    in the given process pool if any.
+    """
+    import numpy as np
+    population_size = len(population)
+    if population_size % game_size != 0:
+        raise ValueError(f"Population size ({population_size}) should be a multiple of game size ({game_size})")
+
+    # Draw the candidates and the seed of every game
+    groups = [
+        group
+        for _ in range(games_per_candidate)
+        for group in rng.permutation(population_size).reshape(-1, game_size)
+    ]
+    seeds = rng.integers(2 ** 63, size=len(groups)).tolist()
+
+    # Play the games
+    matrices = [np.asarray(population[group]) for group in groups]
+    if executor is not None:
+        results = executor.map(play_game, matrices, seeds, [vectorized] * len(groups), [cache] * len(groups))
+    else:
+        results = map(play_game, matrices, seeds, [vectorized] * len(groups), [cache] * len(groups))
+
+    # Convert the ranks to scores and average them by candidate
+    scores = np.zeros(population_size)
+    for group, ranks in zip(groups, results):
+        scores[group] += (game_size - np.array(ranks)) / (game_size - 1)
+    return scores / games_per_candidate
+
+
+def next_generation(
+    population: "np.ndarray",
+    fitness: "np.ndarray",
+    rng: "np.random.Generator",
+    elite: int = 2,
+    mutation_scale: float = 0.1,
+) -> "np.ndarray":
+    """
+    Build the next generation of a population: the `elite` best candidates
+    are kept as is, the others are children of two parents chosen by
+    tournaments of two candidates, with a uniform crossover and a gaussian
+    mutation of standard deviation `mutation_scale`.
+    """
+    import numpy as np
+    population_size = len(population)
+    population = np.asarray(population)
+    order = np.argsort(-fitness, kind="stable")
+    number_of_children = population_size - elite
+
+    # Select the parents by tournaments
+    contenders = rng.integers(population_size, size=(2, number_of_children, 2))
+    winners = np.where(fitness[contenders[..., 0]] >= fitness[contenders[..., 1]], contenders[..., 0], contenders[..., 1])
+
+    # Cross and mutate
+    mask = rng.random((number_of_children, *MATRIX_SHAPE)) < 0.5
+    children = np.where(mask, population[winners[0]], population[winners[1]])
+    children += rng.normal(scale=mutation_scale, size=children.shape)
+
+    # Return
+    return np.concatenate([population[order[:elite]], children])
+
+
+def __save(path: str, array: "np.ndarray") -> None:
+    """
+    Save an array to a `.npy` file atomically, so that an interrupted run
+    never leaves a truncated checkpoint.
+    """
+    import numpy as np
+    temporary_path = path + ".tmp.npy"
+    np.save(temporary_path, array)
+    os.replace(temporary_path, path)
+
+
+def __latest_checkpoint(checkpoint_dir: str) -> int | None:
+    """
+    Returns the generation of the latest population saved in a directory.
+    """
+    generations = [
+        int(os.path.basename(path)[len("population_"):-len(".npy")])
+        for path in glob.glob(os.path.join(checkpoint_dir, "population_[0-9]*.npy"))
+    ]
+    return max(generations) if generations else None
+
+
+def evolve(
+    population_size: int = 96,
+    generations: int = 20,
+    game_size: int = 24,
+    games_per_candidate: int = 4,
+    elite: int = 2,
+    mutation_scale: float = 0.1,
+    workers: int | None = None,
+    checkpoint_dir: str | None = None,
+    seed: int | None = None,
+    vectorized: bool = False,
+    cache_dir: str | None = None,
+    verbose: bool = False,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Evolve a population of `MatrixAgent` matrices with a genetic algorithm,
+    the fitness of a candidate being its survival score over many games (see
+    `evaluate`). Games are played by a pool of `workers` processes (all CPUs
+    by default, 0 to play them in this process).
+
+    If `checkpoint_dir` is given, the population of every generation is saved
+    there as `population_<generation>.npy` (which `MatrixAgent.from_population`
+    can load directly), along with its fitness and best matrix, and the
+    evolution resumes from the latest population found. Give a `seed` to make
+    the run, and its resumption, reproducible. If `cache_dir` is given, the
+    results of the games are kept in a `ResultCache`.
+
+    Returns the population of the last generation (after `generations`
+    rounds of selection) and its fitness.
+    """
+    import numpy as np
+    if seed is None:
+        seed = random.getrandbits(63)
+
+    # Get the initial population, or resume from the latest checkpoint
+    start = None
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        start = __latest_checkpoint(checkpoint_dir)
+    if start is not None:
+        population = np.load(os.path.join(checkpoint_dir, f"population_{start:04d}.npy"))
+    else:
+        start = 0
+        population = np.random.default_rng([seed, 0, 0]).random((population_size, *MATRIX_SHAPE))
+        if checkpoint_dir is not None:
+            __save(os.path.join(checkpoint_dir, f"population_{start:04d}.npy"), population)
+
+    # Evolve
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        fitness = None
+        for generation in range(start, generations + 1):
+
+            # Evaluate the population
+            rng = np.random.default_rng([seed, generation + 1])
+            fitness = evaluate(population, rng, game_size, games_per_candidate, executor, vectorized, cache)
+            if verbose:
+                print(f"Generation {generation}: best fitness {fitness.max():.3f}, mean fitness {utils.mean(fitness.tolist()):.3f} ± {utils.std(fitness.tolist()):.3f}")
+            if checkpoint_dir is not None:
+                __save(os.path.join(checkpoint_dir, f"fitness_{generation:04d}.npy"), fitness)
+                __save(os.path.join(checkpoint_dir, f"best_{generation:04d}.npy"), population[np.argmax(fitness)])
+
+            # Build the next population, unless this is the last generation
+            if generation == generations:
+                break
+            population = next_generation(population, fitness, rng, elite, mutation_scale)
+            if checkpoint_dir is not None:
+                __save(os.path.join(checkpoint_dir, f"population_{generation + 1:04d}.npy"), population)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Return
+    return population, fitness
@@ -0,0 +1,137 @@
+import sqlite3
+from typing import TYPE_CHECKING, Any
+from ..agents import BaseAgent
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Schema of the database: one row per game, one row per tribute of each game,
+# and the parameters of each tribute's agent as key/value pairs
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    game_id TEXT,
+    map_name TEXT,
+    seed INTEGER,
+    turns INTEGER,
+    tributes INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    game INTEGER NOT NULL REFERENCES games(id),
+    character_name TEXT NOT NULL,
+    agent_class TEXT,
+    rank INTEGER,
+    turns INTEGER,
+    cause_of_death TEXT,
+    kills INTEGER,
+    won INTEGER,
+    PRIMARY KEY (game, character_name)
+);
+CREATE TABLE IF NOT EXISTS params (
+    game INTEGER NOT NULL,
+    character_name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value,
+    PRIMARY KEY (game, character_name, key)
+);
+CREATE INDEX IF NOT EXISTS games_map_name ON games (map_name);
+CREATE INDEX IF NOT EXISTS results_agent_class ON results (agent_class, won);
+CREATE INDEX IF NOT EXISTS params_key_value ON params (key, value, game, character_name);
+"""
+
+
+class ResultStore:
+    """
+    Appends the summaries of many games (see `Game.get_summary`) to an
+    indexed SQLite database, with the class and the parameters of the agent of
+    every tribute (see `BaseAgent.get_config`). Games are buffered and written
+    `batch_size` at a time, in a single transaction. Use `query` to get
+    results, e.g. the win rate of hostile agents on the jungle map:
+
+        SELECT AVG(r.won) FROM results r
+        JOIN games g ON g.id = r.game
+        JOIN params p ON p.game = r.game AND p.character_name = r.character_name
+        WHERE g.map_name = 'jungle' AND p.key = 'hostility' AND p.value >= 0.7
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.__pending: list[tuple[dict[str, Any], dict[str, dict[str, Any]], int | None]] = []
+
+
+    def add(self, summary: dict[str, Any], agents: list[BaseAgent] | None = None, seed: int | None = None) -> None:
+        """
+        Add the summary of a game, with the agents that played it if known.
+        The game is written with the next batch.
+        """
+        configs = {agent.name: agent.get_config() for agent in agents or []}
+        self.__pending.append((summary, configs, seed))
+        if len(self.__pending) >= self.batch_size:
+            self.flush()
+
+
+    def flush(self) -> None:
+        """
+        Write all the pending games in a single transaction.
+        """
+        if not self.__pending:
+            return
+        with self.connection:
+            results = []
+            params = []
+            for summary, configs, seed in self.__pending:
+                game = self.connection.execute(
+                    "INSERT INTO games (game_id, map_name, seed, turns, tributes) VALUES (?, ?, ?, ?, ?)",
+                    (summary["id"], summary.get("map_name"), seed, summary["turns"], len(summary["placements"])),
+                ).lastrowid
+                winners = summary["winners"]
+                for placement in summary["placements"]:
+                    name = placement["character_name"]
+                    config = dict(configs.get(name, {}))
+                    agent_class = config.pop("class", None)
+                    config.pop("name", None)
+                    results.append((
+                        game,
+                        name,
+                        agent_class,
+                        placement["rank"],
+                        placement["turns"],
+                        placement["cause_of_death"],
+                        placement["kills"],
+                        int(len(winners) == 1 and name in winners),
+                    ))
+                    params.extend((game, name, key, value) for key, value in config.items() if not isinstance(value, (list, dict)))
+            self.connection.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", results)
+            self.connection.executemany("INSERT INTO params VALUES (?, ?, ?, ?)", params)
+        self.__pending = []
+
+
+    def query(self, sql: str, parameters: tuple | dict = ()) -> "pd.DataFrame":
+        """
+        Run a query on the database (after writing the pending games), and
+        return its result as a DataFrame.
+        """
+        self.flush()
+        import pandas as pd
+        return pd.read_sql_query(sql, self.connection, params=parameters)
+
+
+    def close(self) -> None:
+        """
+        Write the pending games and close the database.
+        """
+        self.flush()
+        self.connection.close()
+
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
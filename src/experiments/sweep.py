@@ -0,0 +1,226 @@
+import os
+import csv
+import random
+import itertools
+from typing import TYPE_CHECKING, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ..agents import BaseAgent, RandomAgent
+from ..shared import utils
+from .cache import ResultCache, get_leaderboard
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Name of the swept agent in every game
+CANDIDATE_NAME = "Candidate"
+
+# Columns of the file holding the results of the games played so far
+RESULTS_COLUMNS = ["configuration", "game", "seed", "rank", "cause_of_death", "kills"]
+
+
+def grid(**values: list[Any]) -> list[dict[str, Any]]:
+    """
+    Returns all combinations of the given parameter values, e.g.
+    `grid(resilience=[0.2, 0.8], hostility=[0.2, 0.8])` gives 4 configurations.
+    """
+    names = list(values.keys())
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+
+def random_samples(n: int, seed: int | None = None, **ranges: tuple[float, float]) -> list[dict[str, float]]:
+    """
+    Returns `n` configurations with parameter values drawn uniformly in the
+    given ranges, e.g. `random_samples(100, resilience=(0, 1), hostility=(0, 1))`.
+    """
+    rng = random.Random(seed)
+    return [{name: rng.uniform(low, high) for name, (low, high) in ranges.items()} for _ in range(n)]
+
+
+def __configuration_key(parameters: dict[str, Any]) -> str:
+    """
+    Returns a string identifying a configuration, independently of its
+    position in the sweep.
+    """
+    return ";".join(f"{name}={parameters[name]!r}" for name in sorted(parameters))
+
+
+def play_game(
+    agent_class: type[BaseAgent],
+    parameters: dict[str, Any],
+    opponent_class: type[BaseAgent],
+    game_size: int,
+    seed: int,
+    vectorized: bool = False,
+    cache: ResultCache | None = None,
+) -> dict[str, Any]:
+    """
+    Play a single game between an agent of `agent_class` created with the
+    given parameters and `game_size - 1` opponents, and return the final rank,
+    cause of death and number of kills of the agent. The game is reproducible
+    from its seed, and taken from the cache if it has already been played.
+    """
+    agents = [opponent_class(name=str(i)) for i in range(game_size - 1)]
+    agents.insert(random.Random(seed).randrange(game_size), agent_class(name=CANDIDATE_NAME, **parameters))
+    leaderboard = get_leaderboard(agents, seed, vectorized=vectorized, cache=cache)
+    result = leaderboard[leaderboard["character_name"] == CANDIDATE_NAME].iloc[0]
+    return {
+        "rank": int(result["rank"]),
+        "cause_of_death": result["cause_of_death"],
+        "kills": int(result["kills"]),
+    }
+
+
+def __load_results(results_path: str | None) -> list[dict[str, Any]]:
+    """
+    Load the results saved by a previous, possibly interrupted, sweep.
+    """
+    if results_path is None or not os.path.exists(results_path):
+        return []
+    with open(results_path, "r", encoding="utf8", newline="") as f:
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    return [
+        {
+            "configuration": row["configuration"],
+            "game": int(row["game"]),
+            "seed": int(row["seed"]),
+            "rank": int(row["rank"]),
+            "cause_of_death": row["cause_of_death"],
+            "kills": int(row["kills"]),
+        }
+        for row in rows
+    ]
+
+
+def __summarize(
+    configurations: list[dict[str, Any]],
+    results: list[dict[str, Any]],
+    z: float = 1.96,
+) -> "pd.DataFrame":
+    """
+    Summarize the results of the games in a tidy table, with one row per
+    configuration and metric, and the bounds of a confidence interval.
+    """
+    results_by_configuration = {}
+    for result in results:
+        results_by_configuration.setdefault(result["configuration"], []).append(result)
+    causes_of_death = sorted(set(result["cause_of_death"] for result in results) - {""})
+
+    rows = []
+    for parameters in configurations:
+        configuration_results = results_by_configuration.get(__configuration_key(parameters), [])
+        games = len(configuration_results)
+        if games == 0:
+            continue
+
+        # Rates, with the Wilson interval (within [0, 1], even for 0% or 100%)
+        rates = {"win_rate": sum(result["rank"] == 1 for result in configuration_results)}
+        for cause in causes_of_death:
+            rates[f"death_{cause}"] = sum(result["cause_of_death"] == cause for result in configuration_results)
+        metrics = {}
+        for metric, successes in rates.items():
+            lower, upper = utils.wilson_interval(successes, games, z)
+            metrics[metric] = {"mean": successes / games, "lower": lower, "upper": upper}
+
+        # Means, with the standard error of the mean
+        for metric, key in [("mean_rank", "rank"), ("mean_kills", "kills")]:
+            values = [result[key] for result in configuration_results]
+            mean, sem = utils.mean(values), utils.std(values) / games**0.5
+            metrics[metric] = {"mean": mean, "lower": mean - z * sem, "upper": mean + z * sem}
+
+        # Add the rows
+        for metric, statistics in metrics.items():
+            rows.append({
+                **parameters,
+                "games": games,
+                "metric": metric,
+                "value": statistics["mean"],
+                "lower": statistics["lower"],
+                "upper": statistics["upper"],
+            })
+
+    import pandas as pd
+    return pd.DataFrame(rows)
+
+
+def sweep(
+    agent_class: type[BaseAgent],
+    configurations: list[dict[str, Any]],
+    games: int = 100,
+    game_size: int = 24,
+    opponent_class: type[BaseAgent] = RandomAgent,
+    workers: int | None = None,
+    results_path: str | None = None,
+    seed: int = 0,
+    vectorized: bool = False,
+    cache_dir: str | None = None,
+    verbose: bool = False,
+) -> "pd.DataFrame":
+    """
+    Evaluate many parameter configurations of an agent class (e.g. built with
+    `grid` or `random_samples` over the arguments of `PersonalityAgent` or
+    `TransitionAgent`). Each configuration plays `games` games against
+    `game_size - 1` opponents of `opponent_class`, the games being played by
+    a pool of `workers` processes (all CPUs by default, 0 to play them in this
+    process). The `i`-th game of every configuration uses the same seed.
+
+    If `results_path` is given, the result of every game is appended to this
+    TSV file as soon as it is known, and games already in the file are not
+    played again, so that an interrupted sweep can be resumed. If `cache_dir`
+    is given, games are also looked up in (and added to) a `ResultCache`
+    shared by all sweeps, so that identical games are never played twice.
+
+    Returns a tidy table with, for each configuration, its parameters, the
+    number of games, and one row per metric (`win_rate`, `mean_rank`,
+    `mean_kills` and `death_<cause>` for each cause of death) with its value
+    and the bounds of its 95% confidence interval.
+    """
+    # Get the games left to play
+    results = __load_results(results_path)
+    done = set((result["configuration"], result["game"]) for result in results)
+    tasks = [
+        (__configuration_key(parameters), game, parameters, random.Random(f"{seed}-{game}").getrandbits(63))
+        for parameters in configurations
+        for game in range(games)
+        if (__configuration_key(parameters), game) not in done
+    ]
+
+    # Play them, saving each result as soon as it is known
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    results_file = None
+    if results_path is not None:
+        new_file = not os.path.exists(results_path)
+        results_file = open(results_path, "a", encoding="utf8", newline="")
+        writer = csv.DictWriter(results_file, fieldnames=RESULTS_COLUMNS, delimiter="\t")
+        if new_file:
+            writer.writeheader()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        if executor is not None:
+            futures = {
+                executor.submit(play_game, agent_class, parameters, opponent_class, game_size, game_seed, vectorized, cache): (key, game, game_seed)
+                for key, game, parameters, game_seed in tasks
+            }
+            completed = ((futures[future], future.result()) for future in as_completed(futures))
+        else:
+            completed = (
+                ((key, game, game_seed), play_game(agent_class, parameters, opponent_class, game_size, game_seed, vectorized, cache))
+                for key, game, parameters, game_seed in tasks
+            )
+        for i, ((key, game, game_seed), result) in enumerate(completed):
+            result = {"configuration": key, "game": game, "seed": game_seed, **result}
+            results.append(result)
+            if results_file is not None:
+                writer.writerow(result)
+                results_file.flush()
+            if verbose:
+                print(f"\r{i + 1}/{len(tasks)} games played", end="", flush=True)
+        if verbose and tasks:
+            print()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if results_file is not None:
+            results_file.close()
+
+    # Return
+    return __summarize(configurations, results)
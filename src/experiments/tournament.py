@@ -0,0 +1,178 @@
+import copy
+import random
+import itertools
+from typing import Any, Literal
+from concurrent.futures import ProcessPoolExecutor
+from ..agents import BaseAgent, RandomAgent
+from ..shared import utils
+from .cache import ResultCache, get_leaderboard
+
+
+# Label of the games that were not won by a single contender
+NO_WINNER = "<none>"
+
+
+def play_game(
+    contenders: list[BaseAgent],
+    fillers: int,
+    seed: int,
+    vectorized: bool = False,
+    cache: ResultCache | None = None,
+) -> str:
+    """
+    Play a single game between the contenders and `fillers` random agents,
+    and return the name of the winner (or `NO_WINNER` if the game was won by a
+    random agent or ended without a single winner). The contenders are copied,
+    so that every game starts with fresh agents.
+    """
+    agents = copy.deepcopy(contenders) + [RandomAgent(name=f"Filler {i}") for i in range(fillers)]
+    random.Random(seed).shuffle(agents)
+    leaderboard = get_leaderboard(agents, seed, vectorized=vectorized, cache=cache)
+    winners = leaderboard[leaderboard["rank"] == 1]["character_name"].tolist()
+    contender_names = [contender.name for contender in contenders]
+    return winners[0] if len(winners) == 1 and winners[0] in contender_names else NO_WINNER
+
+
+def __win_rates(winners: list[str], names: list[str], z: float) -> dict[str, dict[str, float]]:
+    """
+    Returns the number of wins and the win rate of each contender, with the
+    bounds of its Wilson interval, which never has a zero width (even when a
+    contender has won no game or all of them).
+    """
+    games = len(winners)
+    win_rates = {}
+    for name in names:
+        wins = winners.count(name)
+        lower, upper = utils.wilson_interval(wins, games, z)
+        win_rates[name] = {"wins": wins, "mean": wins / games if games else 0, "lower": lower, "upper": upper}
+    return win_rates
+
+
+def __compare(win_rates: dict[str, dict[str, float]], a: str, b: str, games: int, z: float) -> dict[str, Any]:
+    """
+    Compare the win rates of two contenders. As both come from the same games,
+    the variance of their difference is `(p_a + p_b - (p_a - p_b)^2) / n`,
+    estimated after adding `z^2 / 2` wins to each contender and `z^2` games
+    (as in the Agresti-Coull interval), so that it is never zero.
+    """
+    adjusted_games = games + z**2
+    p_a = (win_rates[a]["wins"] + z**2 / 2) / adjusted_games
+    p_b = (win_rates[b]["wins"] + z**2 / 2) / adjusted_games
+    std = ((p_a + p_b - (p_a - p_b)**2) / adjusted_games) ** 0.5
+    difference = win_rates[a]["mean"] - win_rates[b]["mean"]
+    return {
+        "a": a,
+        "b": b,
+        "difference": difference,
+        "lower": difference - z * std,
+        "upper": difference + z * std,
+        "settled": abs(difference) > z * std,
+    }
+
+
+def tournament(
+    contenders: list[BaseAgent],
+    fillers: int = 0,
+    precision: float | None = 0.02,
+    pairs: list[tuple[str, str]] | Literal["all"] | None = None,
+    z: float = 1.96,
+    min_games: int = 100,
+    max_games: int = 100000,
+    batch_size: int = 100,
+    workers: int | None = None,
+    seed: int = 0,
+    vectorized: bool = False,
+    cache_dir: str | None = None,
+    verbose: bool = False,
+) -> dict[str, Any]:
+    """
+    Play games between the contenders (and `fillers` random agents) until the
+    outcome of the tournament is known, instead of a fixed number of games.
+    After each batch of `batch_size` games (at least `min_games`, at most
+    `max_games`), the win rates are estimated with their Wilson intervals, and
+    the tournament stops as soon as:
+    - all the win rates are known within `± precision` (half-width of 95%
+      intervals by default, see `z`), or
+    - all the comparisons of `pairs` (pairs of names, or "all") are settled,
+      i.e. the interval of the difference between the two win rates does not
+      contain 0.
+    As the stopping rules are checked after every batch, a larger `z` can be
+    used to keep the overall error rate low on long tournaments.
+
+    Games are played by a pool of `workers` processes (all CPUs by default, 0
+    to play them in this process), and the `i`-th game always uses the same
+    seed. Returns the number of games played, the reason why the tournament
+    stopped, and tables of the win rates and of the comparisons.
+    """
+    names = [contender.name for contender in contenders]
+    if pairs == "all":
+        pairs = list(itertools.combinations(names, 2))
+    unknown_names = set(name for pair in pairs or [] for name in pair) - set(names)
+    if unknown_names:
+        raise ValueError(f"Unknown contenders in `pairs`: {sorted(unknown_names)}")
+    if precision is None and not pairs:
+        raise ValueError("At least one stopping rule (`precision` or `pairs`) is needed")
+
+    # Play batches of games until a stopping rule is met
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    winners = []
+    reason = "max_games"
+    try:
+        while len(winners) < max_games:
+
+            # Play a batch of games
+            seeds = [random.Random(f"{seed}-{game}").getrandbits(63) for game in range(len(winners), min(len(winners) + batch_size, max_games))]
+            arguments = [[contenders] * len(seeds), [fillers] * len(seeds), seeds, [vectorized] * len(seeds), [cache] * len(seeds)]
+            if executor is not None:
+                winners += list(executor.map(play_game, *arguments))
+            else:
+                winners += list(map(play_game, *arguments))
+            if len(winners) < min_games:
+                continue
+
+            # Check the stopping rules
+            win_rates = __win_rates(winners, names, z)
+            comparisons = [__compare(win_rates, a, b, len(winners), z) for a, b in pairs or []]
+            widest = max((win_rate["upper"] - win_rate["lower"]) / 2 for win_rate in win_rates.values())
+            if verbose:
+                print(f"\r{len(winners)} games played, widest interval ± {widest:.3f}, {sum(c['settled'] for c in comparisons)}/{len(comparisons)} comparisons settled", end="", flush=True)
+            if precision is not None and widest <= precision:
+                reason = "precision"
+                break
+            if comparisons and all(comparison["settled"] for comparison in comparisons):
+                reason = "settled"
+                break
+        if verbose:
+            print()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Build the tables
+    import pandas as pd
+    games = len(winners)
+    win_rates = __win_rates(winners, names, z)
+    comparisons = [__compare(win_rates, a, b, games, z) for a, b in pairs or []]
+    win_rates = pd.DataFrame([
+        {
+            "name": name,
+            "games": games,
+            "win_rate": win_rate["mean"],
+            "lower": win_rate["lower"],
+            "upper": win_rate["upper"],
+        }
+        for name, win_rate in win_rates.items()
+    ])
+    comparisons = pd.DataFrame(
+        comparisons,
+        columns=["a", "b", "difference", "lower", "upper", "settled"],
+    )
+
+    # Return
+    return {
+        "games": games,
+        "reason": reason,
+        "win_rates": win_rates,
+        "comparisons": comparisons,
+    }
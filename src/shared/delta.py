@@ -0,0 +1,139 @@
+from typing import Any
+
+
+# Keys of `state["game"]["state"]` that are compared between two states
+GAME_STATE_KEYS = ["day", "time", "phase"]
+
+
+def game_delta(state: dict[str, Any], previous_state: dict[str, Any] | None = None) -> dict[str, Any]:
+    """
+    Returns the part of a delta that is shared by all characters, i.e. what
+    changed in `state["game"]` since `previous_state` (the last state observed
+    by the agents). If there is no previous state, the whole game state is
+    returned, including the lists of alive and dead characters. Otherwise,
+    only the characters that died since `previous_state` are given.
+    """
+    game_state = state["game"]["state"]
+
+    # First observation: send everything
+    if previous_state is None:
+        return {
+            "id": state["game"]["id"],
+            "state": {
+                **{key: game_state[key] for key in GAME_STATE_KEYS},
+                "alive_characters": list(game_state["alive_characters"]),
+                "dead_characters": list(game_state["dead_characters"]),
+            },
+            "messages": state["game"]["messages"],
+        }
+
+    # Otherwise, only send what changed
+    previous_game_state = previous_state["game"]["state"]
+    delta_state = {key: game_state[key] for key in GAME_STATE_KEYS if game_state[key] != previous_game_state[key]}
+    if len(game_state["dead_characters"]) != len(previous_game_state["dead_characters"]):
+        previously_dead = set(previous_game_state["dead_characters"])
+        delta_state["newly_dead_characters"] = [c for c in game_state["dead_characters"] if c not in previously_dead]
+    return {
+        "id": state["game"]["id"],
+        "state": delta_state,
+        "messages": state["game"]["messages"],
+    }
+
+
+def state_delta(
+    state: dict[str, Any],
+    name: str,
+    previous_state: dict[str, Any] | None = None,
+    shared: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Returns what changed for the character `name` between `previous_state`
+    and `state` (both as returned by `Game.get_state_of_game`): the values of
+    their own state that changed, their new private messages, and the shared
+    part given by `game_delta` (which can be computed once and passed as
+    `shared` when building the deltas of many characters). The delta has the
+    same layout as a state, but only contains the character `name`.
+    """
+    if shared is None:
+        shared = game_delta(state, previous_state)
+
+    # Get the values of the character's state that changed
+    character_state = state["characters"][name]["state"]
+    if previous_state is None:
+        delta_character_state = dict(character_state)
+    else:
+        previous_character_state = previous_state["characters"][name]["state"]
+        delta_character_state = {
+            key: value for key, value in character_state.items()
+            if previous_character_state.get(key) != value
+        }
+
+    # Return
+    return {
+        "game": shared,
+        "characters": {
+            name: {
+                "name": name,
+                "state": delta_character_state,
+                "messages": state["characters"][name]["messages"],
+            },
+        },
+    }
+
+
+class StateView:
+    """
+    Maintains the view of the game of a single character from the deltas
+    built by `state_delta`. The view has the same layout as the state returned
+    by `Game.get_state_of_game`, except that `"characters"` only contains the
+    character itself.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state: dict[str, Any] | None = None
+
+
+    def update(self, delta: dict[str, Any]) -> dict[str, Any]:
+        """
+        Apply a delta to the view, and return the updated view.
+        """
+        game = delta["game"]
+        character = delta["characters"][self.name]
+
+        # First delta: it contains everything
+        if self.state is None:
+            self.state = {
+                "game": {
+                    "id": game["id"],
+                    "state": {key: value for key, value in game["state"].items()},
+                    "messages": game["messages"],
+                },
+                "characters": {
+                    self.name: {
+                        "name": self.name,
+                        "state": dict(character["state"]),
+                        "messages": character["messages"],
+                    },
+                },
+            }
+            return self.state
+
+        # Update the game state
+        game_state = self.state["game"]["state"]
+        for key, value in game["state"].items():
+            if key != "newly_dead_characters":
+                game_state[key] = value
+        if "newly_dead_characters" in game["state"]:
+            newly_dead = set(game["state"]["newly_dead_characters"])
+            game_state["alive_characters"] = [c for c in game_state["alive_characters"] if c not in newly_dead]
+            game_state["dead_characters"] = game_state["dead_characters"] + game["state"]["newly_dead_characters"]
+        self.state["game"]["id"] = game["id"]
+        self.state["game"]["messages"] = game["messages"]
+
+        # Update the character's state
+        self.state["characters"][self.name]["state"].update(character["state"])
+        self.state["characters"][self.name]["messages"] = character["messages"]
+
+        # Return
+        return self.state
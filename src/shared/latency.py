@@ -0,0 +1,149 @@
+import time
+import contextlib
+from typing import Any
+from . import utils
+
+
+# Kinds of calls made to a whole class of agents at once (see
+# `BaseAgent.interrogate_batch`), measured per call for the class, and the
+# kind of call under which their amortized cost (the time of the call divided
+# by its number of agents) is recorded for each agent
+BATCHED_CALLS = {"interrogate_batch": "interrogate_amortized"}
+
+# Kinds of calls recorded for each agent: made to the agent alone, or the
+# amortized cost of a batched call
+CALLS = ["give_state_of_game", "interrogate", *BATCHED_CALLS.values()]
+
+
+class DecisionLatencies:
+    """
+    Records the wall time and the CPU time (of the calling thread, unless the
+    body of `measure` gives the CPU time of the thread that made the call)
+    spent by the agents of a game in each of their calls (see `CALLS`).
+    Batched calls (see `BATCHED_CALLS`) make the decisions of many agents at
+    once: they are recorded as one sample per call for the class of the
+    agents, with the number of agents of the call, and each agent is given
+    its amortized cost under a separate kind of call (e.g.
+    "interrogate_amortized" rather than "interrogate"), as the time of a
+    single decision is not known.
+    """
+
+    def __init__(self):
+        self.classes: dict[str, str] = {}
+        self.wall: dict[str, dict[str, list[float]]] = {}
+        self.cpu: dict[str, dict[str, list[float]]] = {}
+        self.batches: dict[str, dict[str, tuple[list[float], list[float], list[int]]]] = {}
+
+
+    @contextlib.contextmanager
+    def measure(self, agents: list, call: str):
+        """
+        Context manager measuring the time spent in its body by the agents:
+        a single agent for `CALLS`, or the agents of a class for
+        `BATCHED_CALLS`. It yields a dictionary where the body can set the
+        "cpu" time of the call when it was made by another thread (None if
+        unknown, e.g. for a call that timed out).
+        """
+        timing = {}
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield timing
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = timing["cpu"] if "cpu" in timing else time.thread_time() - cpu_start
+            if call in BATCHED_CALLS:
+                class_name = agents[0].__class__.__name__
+                batches = self.batches.setdefault(class_name, {call_: ([], [], []) for call_ in BATCHED_CALLS})
+                batches[call][0].append(wall)
+                batches[call][1].append(cpu)
+                batches[call][2].append(len(agents))
+                call = BATCHED_CALLS[call]
+                wall = wall / len(agents)
+                cpu = cpu / len(agents) if cpu is not None else None
+            for agent in agents:
+                if agent.name not in self.classes:
+                    self.classes[agent.name] = agent.__class__.__name__
+                    self.wall[agent.name] = {call_: [] for call_ in CALLS}
+                    self.cpu[agent.name] = {call_: [] for call_ in CALLS}
+                self.wall[agent.name][call].append(wall)
+                self.cpu[agent.name][call].append(cpu)
+
+
+    @staticmethod
+    def __statistics(wall: list[float], cpu: list[float]) -> dict[str, float]:
+        """
+        Returns the number of calls, and the total time and the percentiles of
+        a call (in milliseconds), for both the wall and the CPU time. Calls of
+        unknown CPU time are left out of the CPU statistics.
+        """
+        if not wall:
+            return {"calls": 0}
+        cpu = [value for value in cpu if value is not None]
+        if not cpu:
+            cpu = [float("nan")]
+        return {
+            "calls": len(wall),
+            "wall_total_ms": 1000 * sum(wall),
+            **{f"wall_{key}_ms": 1000 * value for key, value in utils.percentiles(wall).items()},
+            "wall_max_ms": 1000 * max(wall),
+            "cpu_total_ms": 1000 * sum(cpu),
+            **{f"cpu_{key}_ms": 1000 * value for key, value in utils.percentiles(cpu).items()},
+            "cpu_max_ms": 1000 * max(cpu),
+        }
+
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns the statistics of each kind of call, per agent and per agent
+        class. Batched calls are reported per class, one sample per call, with
+        the mean number of agents per call (`agents_per_call`), and per agent
+        as their amortized cost (see `BATCHED_CALLS`).
+        """
+        agents = {}
+        classes = {}
+        for name, class_name in self.classes.items():
+            agents[name] = {"class": class_name}
+            classes.setdefault(class_name, {call: ([], []) for call in CALLS})
+            for call in CALLS:
+                agents[name][call] = self.__statistics(self.wall[name][call], self.cpu[name][call])
+                classes[class_name][call][0].extend(self.wall[name][call])
+                classes[class_name][call][1].extend(self.cpu[name][call])
+        report = {
+            "agents": agents,
+            "classes": {
+                class_name: {call: self.__statistics(*measures[call]) for call in CALLS}
+                for class_name, measures in classes.items()
+            },
+        }
+        for class_name, batches in self.batches.items():
+            calls = report["classes"][class_name]
+            for call, (wall, cpu, sizes) in batches.items():
+                calls[call] = self.__statistics(wall, cpu)
+                if sizes:
+                    calls[call]["agents_per_call"] = utils.mean(sizes)
+        return report
+
+
+    def summary(self) -> str:
+        """
+        Returns a short text summary of the report, one line per agent class
+        and kind of call.
+        """
+        lines = []
+        for class_name, calls in self.report()["classes"].items():
+            for call, statistics in calls.items():
+                if statistics["calls"] == 0:
+                    continue
+                if call in BATCHED_CALLS:
+                    per_call = f" (per batched call of {statistics['agents_per_call']:.1f} agents)"
+                elif call in BATCHED_CALLS.values():
+                    per_call = " (amortized per agent over batched calls)"
+                else:
+                    per_call = ""
+                lines.append(
+                    f"{class_name}.{call}: {statistics['calls']} calls{per_call}, "
+                    f"wall p50 {statistics['wall_p50_ms']:.3f} ms / p99 {statistics['wall_p99_ms']:.3f} ms / total {statistics['wall_total_ms']:.1f} ms, "
+                    f"CPU p50 {statistics['cpu_p50_ms']:.3f} ms / p99 {statistics['cpu_p99_ms']:.3f} ms / total {statistics['cpu_total_ms']:.1f} ms"
+                )
+        return "\n".join(lines)
@@ -0,0 +1,127 @@
+import os
+import io
+import json
+import gzip
+from typing import TYPE_CHECKING, Any, Literal
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Compressions of the logs, and the extensions of their files
+EXTENSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# Compression level of gzip, faster than the default one for a similar ratio
+# on the logs
+GZIP_LEVEL = 6
+
+
+def get_compression(path: str) -> Literal["gzip", "zstd"] | None:
+    """
+    Returns the compression of a log, given by the extension of its file.
+    """
+    for compression, extension in EXTENSIONS.items():
+        if extension and path.endswith(extension):
+            return compression
+    return None
+
+
+def __open_zstd(path: str, mode: str) -> io.TextIOBase:
+    """
+    Open a zstd file in text mode, with the standard library (Python 3.14+)
+    or the `zstandard` package.
+    """
+    try:
+        from compression import zstd
+        return zstd.open(path, mode + "t", encoding="utf8")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd logs need Python 3.14+ or the `zstandard` package") from None
+    return zstandard.open(path, mode + "t", encoding="utf8")
+
+
+def open_log(path: str, mode: Literal["r", "w", "a"] = "r") -> io.TextIOBase:
+    """
+    Open a log in text mode, through a streaming compressor or decompressor if
+    its extension is one of `EXTENSIONS`. Compressed files opened in append
+    mode get a new compressed stream after the existing ones, which readers
+    decompress as a whole.
+    """
+    if mode != "r":
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    compression = get_compression(path)
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf8", compresslevel=GZIP_LEVEL)
+    if compression == "zstd":
+        return __open_zstd(path, mode)
+    return open(path, mode, encoding="utf8")
+
+
+def read_text_log(path: str) -> str:
+    """
+    Returns the content of a text log (see `api`'s `save_txt`).
+    """
+    with open_log(path) as f:
+        return f.read()
+
+
+def read_tsv_log(path: str) -> "pd.DataFrame":
+    """
+    Returns the full state history of a game (see `api`'s `save_tsv`).
+    """
+    import pandas as pd
+    with open_log(path) as f:
+        return pd.read_csv(f, sep="\t")
+
+
+def read_jsonl_log(path: str) -> list[dict[str, Any]]:
+    """
+    Returns the entries of a JSON Lines log (e.g. an `LLMAgent` transcript).
+    """
+    with open_log(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TextLogWriter:
+    """
+    Writes the text log of a game as it goes, one block of messages per state,
+    separated by blank lines, compressed if the extension of the file asks for
+    it (see `open_log`). Uncompressed blocks are written and flushed at once,
+    so memory stays constant, the file can be followed with `tail -f`, and a
+    partial log survives a crash. Compressed blocks are left to the buffering
+    of the compressor, as flushing it after every block hurts the ratio.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open_log(path, "w")
+        self.flush = get_compression(path) is None
+        self.blocks = 0
+
+
+    def write(self, messages: str) -> None:
+        """
+        Append a block of messages (skipped if empty) to the log.
+        """
+        if not messages:
+            return
+        self.file.write("\n\n" + messages if self.blocks > 0 else messages)
+        if self.flush:
+            self.file.flush()
+        self.blocks += 1
+
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.file.write("\n")
+            self.file.close()
+
+
+    def __enter__(self) -> "TextLogWriter":
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,282 @@
+import time
+from typing import Any
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+
+# Layout of the shared memory block: a header, followed by one row per
+# character. Every value is stored as a 64-bit integer, strings being encoded
+# as their index in the corresponding list below. The sequence number is a
+# seqlock: it is odd while a state is being written, and even once it is
+# complete.
+HEADER_FIELDS = ["sequence", "day", "time", "phase", "alive_count"]
+CHARACTER_FIELDS = [
+    "alive",
+    "health",
+    "mental",
+    "energy",
+    "hunger",
+    "thirst",
+    "hype",
+    "current_action",
+    "current_spotted_characters",
+    "x",
+    "y",
+    "bag_food",
+    "bag_water",
+    "bag_best_weapon_damage",
+    "bag_weapons_count",
+    "stats_kills",
+    "stats_gifts_received",
+    "stats_cause_of_death",
+]
+TIMES = ["day", "night"]
+PHASES = ["move", "act"]
+ACTIONS = [
+    "none",
+    "run towards",
+    "run away",
+    "go north",
+    "go south",
+    "go east",
+    "go west",
+    "stay",
+    "hunt",
+    "gather",
+    "rest",
+    "hide",
+]
+CAUSES_OF_DEATH = ["", "killed", "hazard", "thirst", "hunger", "madness", "health"]
+CODES = {
+    "time": TIMES,
+    "phase": PHASES,
+    "current_action": ACTIONS,
+    "stats_cause_of_death": CAUSES_OF_DEATH,
+}
+
+
+def block_size(number_of_characters: int) -> int:
+    """
+    Returns the size in bytes of the block holding the state of a game with
+    the given number of characters.
+    """
+    return 8 * (len(HEADER_FIELDS) + number_of_characters * len(CHARACTER_FIELDS))
+
+
+def _encode(field: str, value: Any) -> int:
+    if field in CODES:
+        return CODES[field].index(value)
+    return int(value)
+
+
+def _decode(field: str, value: int) -> Any:
+    if field in CODES:
+        return CODES[field][value]
+    if field == "alive":
+        return bool(value)
+    return value
+
+
+class SharedStateWriter:
+    """
+    Publishes the numeric part of the states of a game (see
+    `Game.get_state_of_game`) in a shared memory block with a fixed layout
+    (see `HEADER_FIELDS` and `CHARACTER_FIELDS`), so that agents running in
+    other processes can read it without copy. Each call to `publish` returns a
+    small notification to send to the workers, messages having to travel on a
+    separate channel. The block is guarded by a seqlock (see `HEADER_FIELDS`),
+    so that readers never see half of a state.
+    """
+
+    def __init__(self, character_names: list[str], name: str | None = None):
+        self.character_names = list(character_names)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=block_size(len(self.character_names)))
+        self.header = np.ndarray((len(HEADER_FIELDS),), dtype=np.int64, buffer=self.shm.buf)
+        self.array = np.ndarray(
+            (len(self.character_names), len(CHARACTER_FIELDS)),
+            dtype=np.int64,
+            buffer=self.shm.buf,
+            offset=8 * len(HEADER_FIELDS),
+        )
+        self.header[:] = 0
+        self.array[:] = 0
+
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+
+    def publish(self, state: dict[str, Any]) -> dict[str, Any]:
+        """
+        Write a state in the shared memory block, and return the notification
+        to send to the workers.
+        """
+        # Encode the state before taking the lock
+        rows = [
+            [_encode(field, state["characters"][name]["state"][field]) for field in CHARACTER_FIELDS]
+            for name in self.character_names
+        ]
+        game_state = state["game"]["state"]
+        header = [
+            game_state["day"],
+            _encode("time", game_state["time"]),
+            _encode("phase", game_state["phase"]),
+            len(game_state["alive_characters"]),
+        ]
+
+        # Write the state between two increments of the sequence number (odd
+        # while writing, even once done)
+        self.header[0] += 1
+        self.array[:] = rows
+        self.header[1:] = header
+        self.header[0] += 1
+
+        # Return the notification
+        return {"name": self.name, "sequence": int(self.header[0])}
+
+
+    def close(self) -> None:
+        """
+        Close and destroy the shared memory block.
+        """
+        del self.header, self.array
+        self.shm.close()
+        self.shm.unlink()
+
+
+    def __enter__(self) -> "SharedStateWriter":
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class SharedStateReader:
+    """
+    Reads the states published by a `SharedStateWriter` from another process.
+    `array` is a read-only view of the block (one row per character, one
+    column per field of `CHARACTER_FIELDS`), which may change while it is read.
+    The dictionaries are built from a consistent copy of the block (see
+    `snapshot`).
+    """
+
+    def __init__(self, name: str, character_names: list[str], game_id: str | None = None):
+        self.character_names = list(character_names)
+        self.game_id = game_id
+        self.__rows = {name_: i for i, name_ in enumerate(self.character_names)}
+
+        # Attach to the block without letting the resource tracker of this
+        # process destroy it when the process exits
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13, where `track` does not exist
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                self.shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+        self.header = np.ndarray((len(HEADER_FIELDS),), dtype=np.int64, buffer=self.shm.buf)
+        self.array = np.ndarray(
+            (len(self.character_names), len(CHARACTER_FIELDS)),
+            dtype=np.int64,
+            buffer=self.shm.buf,
+            offset=8 * len(HEADER_FIELDS),
+        )
+        self.header.flags.writeable = False
+        self.array.flags.writeable = False
+
+
+    @property
+    def sequence(self) -> int:
+        return int(self.header[0])
+
+
+    def column(self, field: str) -> np.ndarray:
+        """
+        Returns the values of a field for all characters (without copy, and
+        thus without any guarantee of consistency, see `snapshot`).
+        """
+        return self.array[:, CHARACTER_FIELDS.index(field)]
+
+
+    def snapshot(self, timeout: float = 1.0) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns a consistent copy of the header and of the characters' rows:
+        the block is copied until the sequence number is the same even number
+        before and after the copy, i.e. no state was written in the meantime.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence = int(self.header[0])
+            if sequence % 2 == 0:
+                header = self.header.copy()
+                array = self.array.copy()
+                if int(self.header[0]) == sequence:
+                    return header, array
+            if time.monotonic() > deadline:
+                raise TimeoutError("The shared state is still being written")
+            time.sleep(0)
+
+
+    def get_character_state(self, name: str, array: np.ndarray | None = None) -> dict[str, Any]:
+        """
+        Returns the state of a character as a dictionary, with the same keys as
+        `Character.get_state` (except the name of the best weapon), from a
+        given snapshot of the rows or from a new one.
+        """
+        if array is None:
+            _, array = self.snapshot()
+        row = array[self.__rows[name]].tolist()
+        return {field: _decode(field, value) for field, value in zip(CHARACTER_FIELDS, row)}
+
+
+    def get_state(self, name: str, messages: list[str] | None = None, public_messages: list[str] | None = None) -> dict[str, Any]:
+        """
+        Returns the view of the game of a character, with the same layout as
+        the state returned by `Game.get_state_of_game` (restricted to the
+        character itself, see `shared.delta.StateView`). The messages are not
+        part of the shared memory block and have to be given.
+        """
+        header, array = self.snapshot()
+        _, day, time_, phase, _ = header.tolist()
+        alive = array[:, CHARACTER_FIELDS.index("alive")].tolist()
+        return {
+            "game": {
+                "id": self.game_id,
+                "state": {
+                    "day": day,
+                    "time": _decode("time", time_),
+                    "phase": _decode("phase", phase),
+                    "alive_characters": [c for c, a in zip(self.character_names, alive) if a],
+                    "dead_characters": [c for c, a in zip(self.character_names, alive) if not a],
+                },
+                "messages": public_messages if public_messages is not None else [],
+            },
+            "characters": {
+                name: {
+                    "name": name,
+                    "state": self.get_character_state(name, array),
+                    "messages": messages if messages is not None else [],
+                },
+            },
+        }
+
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory block (without destroying it).
+        """
+        del self.header, self.array
+        self.shm.close()
+
+
+    def __enter__(self) -> "SharedStateReader":
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
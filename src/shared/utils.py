@@ -1,7 +1,7 @@
 import random
 from typing import Any, Literal
-import warnings
 import hashlib
+from statistics import NormalDist
 
 
 def map_range(x, x1, x2, y1, y2):
@@ -18,6 +18,29 @@ def random_bool(probability: float) -> bool:
     return random.random() < probability
 
 
+def numpy_rng():
+    """
+    Returns a NumPy random generator seeded from the `random` module, so that
+    seeding `random` is enough to reproduce its draws.
+    """
+    import numpy as np  # only for the vectorized functions
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def weighted_choice_indices(weights, rng) -> Any:
+    """
+    Draws one index per row of a 2D NumPy array of weights, with a probability
+    proportional to the weights (i.e. a vectorized `random.choices`). Like
+    `random.choices`, raises a ValueError if the weights of a row are all
+    zero.
+    """
+    cumulative = weights.cumsum(axis=1)
+    if not (cumulative[:, -1] > 0).all():
+        raise ValueError("Total of weights must be greater than zero")
+    thresholds = rng.random((len(weights), 1)) * cumulative[:, -1:]
+    return (cumulative <= thresholds).sum(axis=1)
+
+
 def progress_bar(
     label: str,
     value: int,
@@ -71,58 +94,98 @@ def std(lst: list) -> float:
     return (sum((x - mean)**2 for x in lst) / len(lst))**0.5
 
 
-def bootstrap(lst: list, iterations: int | Literal["inf"] = "inf") -> dict[str, dict[str, float]]:
+def percentiles(lst: list[float], qs: list[float] = [0.5, 0.9, 0.99]) -> dict[str, float]:
     """
-    Perform a bootstrap analysis on a list. Returns a dictionnary, where the
-    keys are the unique elements of the list and the values are also
-    dictionnaries with the mean and the standard deviation of the ratios.
+    Returns the given percentiles of a list (nearest rank), with keys such as
+    "p50" or "p99".
     """
-    # Caching some values
-    len_lst = len(lst)
-    unique_lst = unique(lst)
+    sorted_lst = sorted(lst)
+    return {f"p{round(q * 100)}": sorted_lst[round(q * (len(sorted_lst) - 1))] for q in qs}
 
-    if iterations == "inf":
-
-        result = {}
-        for element in unique_lst:
-            exact_mean = lst.count(element) / len_lst
-            exact_variance = exact_mean * (1 - exact_mean) / len_lst
-            exact_std = exact_variance**0.5
-            result[element] = {
-                "mean": exact_mean,
-                "std": exact_std,
-            }
-        return result
 
-    else:
-
-        # Deprecation warning
-        warnings.warn("Using a finite number of iterations is deprecated. Use 'inf' instead for better results and performance.", DeprecationWarning)
+def wilson_interval(successes: int, n: int, z: float = 1.96) -> tuple[float, float]:
+    """
+    Returns the bounds of the Wilson score interval of a proportion, which
+    stay within [0, 1] and keep a non-zero width when no or all trials
+    succeeded (unlike the normal approximation).
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    center = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+    half_width = z / (1 + z**2 / n) * (p * (1 - p) / n + z**2 / (4 * n**2))**0.5
+    return max(0.0, center - half_width), min(1.0, center + half_width)
 
-        # Define ratios
-        sample_ratios = {
-            element: [] for element in unique_lst
-        }
 
-        for _ in range(iterations):
+def bootstrap(
+    lst: list,
+    iterations: int | Literal["inf"] = "inf",
+    groups: list | None = None,
+    confidence: float = 0.95,
+) -> dict[Any, dict[str, float]]:
+    """
+    Perform a bootstrap analysis on a list. Returns a dictionnary, where the
+    keys are the unique elements of the list and the values are also
+    dictionnaries with the mean and the standard deviation of the ratios, and
+    the bounds of their confidence interval. With `iterations="inf"`, exact
+    values are given (binomial standard error, normal interval); otherwise,
+    the ratios of `iterations` multinomial resamples are drawn at once with
+    NumPy (percentile interval).
+
+    If `groups` is given (a list of the same length as `lst`, e.g. the class
+    or the map of each game), the analysis is done within each group, and the
+    result is a dictionnary with the groups as keys and such dictionnaries as
+    values (with all the elements of `lst` in each group). An empty list
+    gives an empty dictionnary.
+    """
+    if not lst:
+        return {}
+    import numpy as np  # only for the bootstrap
+
+    # Encode the elements and the groups as integers
+    element_codes = {element: i for i, element in enumerate(dict.fromkeys(lst))}
+    group_codes = {group: i for i, group in enumerate(dict.fromkeys(groups if groups is not None else [None]))}
+    element_indices = np.array([element_codes[element] for element in lst], dtype=np.int64)
+    if groups is not None:
+        group_indices = np.array([group_codes[group] for group in groups], dtype=np.int64)
+    else:
+        group_indices = np.zeros(len(lst), dtype=np.int64)
 
-            # Sample `total_count` elements from `lst` with replacement
-            sample = random.choices(lst, k=len_lst)
+    # Count the elements in each group
+    counts = np.bincount(
+        group_indices * len(element_codes) + element_indices,
+        minlength=len(group_codes) * len(element_codes),
+    ).reshape(len(group_codes), len(element_codes))
+    totals = counts.sum(axis=1, keepdims=True)
+    ratios = counts / np.maximum(totals, 1)
 
-            # Add ratios to the dictionary
-            for element in unique_lst:
-                sample_ratios[element].append(sample.count(element) / len_lst)
+    if iterations == "inf":
+        means = ratios
+        stds = (ratios * (1 - ratios) / np.maximum(totals, 1))**0.5
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        lowers = means - z * stds
+        uppers = means + z * stds
 
-        # Put data in the right format
-        result = {
+    else:
+        samples = numpy_rng().multinomial(totals[:, 0], ratios, size=(iterations, len(group_codes))) / np.maximum(totals, 1)
+        means = samples.mean(axis=0)
+        stds = samples.std(axis=0)
+        lowers, uppers = np.quantile(samples, [0.5 - confidence / 2, 0.5 + confidence / 2], axis=0)
+
+    # Put data in the right format
+    result = {
+        group: {
             element: {
-                "mean": mean(sample_ratios[element]),
-                "std": std(sample_ratios[element]),
-            } for element in unique_lst
-        }
+                "mean": float(means[g, e]),
+                "std": float(stds[g, e]),
+                "lower": float(lowers[g, e]),
+                "upper": float(uppers[g, e]),
+            } for element, e in element_codes.items()
+        } for group, g in group_codes.items()
+    }
 
-        # Return
-        return result
+    # Return
+    return result if groups is not None else result[None]
 
 
 def smart_join(lst: list[str], sep: str = ", ", last_sep: str = " and ") -> str:
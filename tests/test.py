@@ -6,7 +6,375 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 # Importing game module
 from src.api import api
-from src.agents import RandomAgent
+from src.engine.game import Game
+from src.agents import BaseAgent, RandomAgent, PersonalityAgent, TransitionAgent
+from src.shared import utils
+from src.shared.logs import EXTENSIONS, open_log, read_text_log, read_jsonl_log
+from src.experiments import sweep, grid, tournament, ResultStore, LogDataset
+from src.shared.shm import SharedStateWriter, SharedStateReader, CHARACTER_FIELDS
+
+
+# Importing other modules
+import glob
+import json
+import shutil
+import time
+import random
+import tempfile
+from types import SimpleNamespace
+from collections import Counter
+
+
+def outcomes(vectorized: bool, games: int, tributes: int = 24) -> dict[str, object]:
+    """
+    Play seeded games with random agents, and return the frequency of each
+    cause of death, the mean length of a game and the mean number of turns
+    survived by a tribute.
+    """
+    causes = Counter()
+    game_turns = []
+    survived_turns = []
+    for seed in range(games):
+        random.seed(seed)
+        summary = api([RandomAgent(str(i)) for i in range(tributes)], return_summary=True, vectorized=vectorized)["summary"]
+        game_turns.append(summary["turns"])
+        for placement in summary["placements"]:
+            causes[placement["cause_of_death"]] += 1
+            survived_turns.append(placement["turns"])
+    return {
+        "causes": {cause: count / sum(causes.values()) for cause, count in causes.items()},
+        "game_turns": sum(game_turns) / len(game_turns),
+        "survived_turns": sum(survived_turns) / len(survived_turns),
+    }
+
+
+def check_vectorized(games: int = 200) -> None:
+    """
+    Check that the vectorized resolution of the engine gives the same
+    distribution of outcomes (placements and causes of death) as the
+    sequential one. The games are seeded, so the check is deterministic.
+    """
+    sequential = outcomes(vectorized=False, games=games)
+    vectorized = outcomes(vectorized=True, games=games)
+    causes = set(sequential["causes"]) | set(vectorized["causes"])
+    distance = sum(abs(sequential["causes"].get(c, 0) - vectorized["causes"].get(c, 0)) for c in causes) / 2
+    assert distance < 0.04, f"Causes of death differ: {sequential['causes']} vs {vectorized['causes']}"
+    for key in ["game_turns", "survived_turns"]:
+        assert abs(vectorized[key] / sequential[key] - 1) < 0.05, f"{key} differ: {sequential[key]:.2f} vs {vectorized[key]:.2f}"
+
+
+def check_batched_decisions(draws: int = 2000, seed: int = 0) -> None:
+    """
+    Check that the batched decisions of the agents draw their actions with the
+    same probabilities as their decisions one by one, on the first states of a
+    game (start, move and act phases), and that all-zero weights are refused
+    like `random.choices` does.
+    """
+    random.seed(seed)
+    agents = [
+        PersonalityAgent("Personality", resilience=0.3, hostility=0.8, impulsivity=0.5),
+        TransitionAgent("Transition", 0.2, 2, 0.9, 0.9, 3, 0.1),
+    ]
+    game_ = Game(character_names=[agent.name for agent in agents], headless=True)
+    game_.start_game()
+    for _ in range(3):
+        state = game_.get_state_of_game()
+        for agent in agents:
+            agent.give_state_of_game(state)
+            one_by_one = Counter(agent.interrogate() for _ in range(draws))
+            batched = Counter(type(agent).interrogate_batch([agent] * draws))
+            distance = sum(abs(one_by_one[a] - batched[a]) for a in one_by_one | batched) / 2 / draws
+            assert distance < 0.05, f"{agent.name} decisions differ: {dict(one_by_one)} vs {dict(batched)}"
+        for agent in agents:
+            game_.set_action(agent.name, agent.interrogate())
+        game_.update_game()
+    import numpy as np
+    try:
+        utils.weighted_choice_indices(np.array([[1.0, 0.0], [0.0, 0.0]]), utils.numpy_rng())
+        raise AssertionError("All-zero weights were drawn from")
+    except ValueError:
+        pass
+
+
+def check_bootstrap() -> None:
+    """
+    Check the edge cases of `utils.bootstrap`: empty lists, and a single
+    group (which must give the same exact intervals as no group).
+    """
+    for iterations in ["inf", 10]:
+        assert utils.bootstrap([], iterations=iterations) == {}
+        assert utils.bootstrap([], iterations=iterations, groups=[]) == {}
+    lst = ["a", "b", "a", "a"]
+    grouped = utils.bootstrap(lst, groups=["g"] * len(lst))
+    assert list(grouped) == ["g"] and grouped["g"] == utils.bootstrap(lst)
+    grouped = utils.bootstrap(lst, iterations=10, groups=["g"] * len(lst))
+    assert list(grouped) == ["g"] and set(grouped["g"]) == {"a", "b"}
+
+
+def check_sweep_intervals(games: int = 10) -> None:
+    """
+    Check that the confidence intervals of the rates of a sweep stay within
+    [0, 1] and contain their value, even for rates of 0% or 100%.
+    """
+    summary = sweep(PersonalityAgent, grid(resilience=[0.0, 1.0], hostility=[1.0], impulsivity=[1.0]), games=games, game_size=6, workers=0)
+    rates = summary[summary["metric"].isin(["win_rate"]) | summary["metric"].str.startswith("death_")]
+    assert ((0 <= rates["lower"]) & (rates["lower"] <= rates["value"]) & (rates["value"] <= rates["upper"]) & (rates["upper"] <= 1)).all()
+    assert ((rates["upper"] - rates["lower"]) > 0).all()
+    lower, upper = utils.wilson_interval(0, games)
+    assert lower == 0 and upper > 0
+
+
+def check_tournament_intervals(games: int = 40) -> None:
+    """
+    Check that the intervals of a tournament stay within [0, 1] and never
+    have a zero width, which would stop it at its first check.
+    """
+    contenders = [PersonalityAgent(f"Contender {i}", resilience=0.0, hostility=1.0, impulsivity=1.0) for i in range(2)]
+    result = tournament(contenders, fillers=10, precision=0.01, pairs="all", min_games=games // 2, max_games=games, batch_size=games // 2, workers=0)
+    assert result["reason"] == "max_games", result["reason"]
+    win_rates = result["win_rates"]
+    assert ((0 <= win_rates["lower"]) & (win_rates["lower"] < win_rates["upper"]) & (win_rates["upper"] <= 1)).all()
+    assert (result["comparisons"]["lower"] < result["comparisons"]["upper"]).all()
+
+
+def check_store_seed(seed: int = 7) -> None:
+    """
+    Check that a game played with a seed is stored with it, and that it can
+    be replayed from the stored seed.
+    """
+    with tempfile.TemporaryDirectory() as directory, ResultStore(os.path.join(directory, "results.db")) as store:
+        summary = api([RandomAgent(str(i)) for i in range(12)], return_summary=True, store=store, seed=seed)["summary"]
+        store.flush()
+        stored_seed = int(store.query("SELECT seed FROM games")["seed"][0])
+        replay = api([RandomAgent(str(i)) for i in range(12)], return_summary=True, seed=stored_seed)["summary"]
+        assert stored_seed == seed and replay["placements"] == summary["placements"]
+
+
+def check_latency_report(tributes: int = 12) -> None:
+    """
+    Check that batched decisions are reported once per call for the class of
+    the agents, and as their amortized cost for each agent, while agents of
+    a class that is not vectorized are timed on their own.
+    """
+    agents = [RandomAgent(str(i)) for i in range(tributes)] + [SlowAgent(f"Slow {i}") for i in range(2)]
+    result = api(agents, measure_latency=True, return_summary=True, seed=0)
+    latency = result["latency"]
+    batches = latency["classes"]["RandomAgent"]["interrogate_batch"]
+    assert batches["calls"] == result["summary"]["turns"], (batches["calls"], result["summary"]["turns"])
+    assert 1 < batches["agents_per_call"] <= tributes
+    amortized = [latency["agents"][agent.name]["interrogate_amortized"] for agent in agents[:tributes]]
+    assert all(statistics["calls"] > 0 and latency["agents"][agent.name]["interrogate"]["calls"] == 0 for agent, statistics in zip(agents, amortized))
+    assert abs(sum(statistics["wall_total_ms"] for statistics in amortized) - batches["wall_total_ms"]) < 1e-6 * batches["wall_total_ms"] + 1e-9
+    for agent in agents[tributes:]:
+        assert latency["agents"][agent.name]["interrogate"]["calls"] > 0
+        assert latency["agents"][agent.name]["interrogate_amortized"]["calls"] == 0
+
+
+class SlowAgent(RandomAgent):
+    """
+    A random agent whose first decision takes `delay` seconds, and whose
+    other decisions take `cpu` seconds of CPU time. It counts the calls made
+    while one of its decisions is still running.
+    """
+    def __init__(self, name: str, delay: float = 0.0, cpu: float = 0.0):
+        super().__init__(name)
+        self.delay = delay
+        self.cpu = cpu
+        self.running = False
+        self.overlapping_calls = 0
+
+    def give_state_of_game(self, game_state: dict) -> None:
+        self.overlapping_calls += self.running
+        super().give_state_of_game(game_state)
+
+    def interrogate(self) -> str:
+        self.overlapping_calls += self.running
+        self.running = True
+        if self.delay:
+            time.sleep(self.delay)
+            self.delay = 0.0
+        cpu_start = time.thread_time()
+        while time.thread_time() - cpu_start < self.cpu:
+            pass
+        self.running = False
+        return super().interrogate()
+
+
+def check_decision_timeout() -> None:
+    """
+    Check that an agent whose decision timed out is replaced by the fallback
+    and not called again until the decision ends, without holding back the
+    other agents of its class (a subclass of a vectorized agent that decides
+    on its own), and that the CPU time of the decisions is measured in the
+    threads making them.
+    """
+    assert RandomAgent.is_vectorized() and not SlowAgent.is_vectorized()
+    agents = [SlowAgent("Slow", delay=0.3), SlowAgent("Busy", cpu=0.005)] + [RandomAgent(str(i)) for i in range(10)]
+    result = api(agents, return_summary=True, measure_latency=True, decision_timeout=0.05, seed=0)
+    reasons = [fallback["reason"] for fallback in result["summary"]["fallbacks"] if fallback["character_name"] == "Slow"]
+    assert reasons[:1] == ["timeout"] and set(reasons) <= {"timeout", "busy"}, reasons
+    assert agents[0].overlapping_calls == 0
+    assert not any(fallback["character_name"] == "Busy" for fallback in result["summary"]["fallbacks"])
+    busy_cpu = result["latency"]["agents"]["Busy"]["interrogate"]
+    assert busy_cpu["cpu_p50_ms"] >= 4, busy_cpu
+
+
+class FailingAgent(RandomAgent):
+    """
+    A random agent whose second decision fails.
+    """
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.decisions = 0
+
+    def interrogate(self) -> str:
+        self.decisions += 1
+        if self.decisions == 2:
+            raise RuntimeError("Failing agent")
+        return super().interrogate()
+
+
+def check_log_closed_on_error() -> None:
+    """
+    Check that the game log is closed (and thus complete, even compressed)
+    when the game fails.
+    """
+    agents = [FailingAgent("Failing")] + [RandomAgent(str(i)) for i in range(23)]
+    logs_before = set(glob.glob(os.path.join("logs", "*.txt.gz")))
+    try:
+        api(agents, save_txt=True, compression="gzip", seed=0)
+        raise AssertionError("The game did not fail")
+    except RuntimeError:
+        (path,) = set(glob.glob(os.path.join("logs", "*.txt.gz"))) - logs_before
+        assert read_text_log(path).endswith("\n")
+
+
+class FakeClient:
+    """
+    Stands for the OpenAI client of an `LLMAgent`, answering with the action
+    of a random agent.
+    """
+
+    def __init__(self, agent: BaseAgent):
+        self.agent = agent
+        self.beta = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=self.parse)))
+
+    def parse(self, **kwargs) -> SimpleNamespace:
+        random_agent = RandomAgent(self.agent.name)
+        random_agent.current_state = self.agent.current_state
+        content = json.dumps({"thoughts": "...", "action": random_agent.interrogate()})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def check_transcripts() -> None:
+    """
+    Check that the transcripts of `LLMAgent`s, written as the game goes, are
+    complete once the game is over, compressed or not. zstd is skipped when
+    it is not available (it needs Python 3.14+ or the `zstandard` package).
+    """
+    from src.agents import LLMAgent
+    for compression in [None, "gzip", "zstd"]:
+        if compression == "zstd":
+            try:
+                with tempfile.TemporaryDirectory() as directory, open_log(os.path.join(directory, "probe.zst"), "w"):
+                    pass
+            except ImportError:
+                print("Skipping the zstd transcripts: zstd is not available")
+                continue
+        agents = [LLMAgent(f"LLM {i}", api_key="-", system_prompt="Survive.", verbose=True, compression=compression) for i in range(2)]
+        for agent in agents:
+            agent.client = FakeClient(agent)
+        result = api(agents + [RandomAgent(str(i)) for i in range(10)], return_summary=True, seed=0)
+        for agent in agents:
+            path = os.path.join("logs", f"log_{result['summary']['id']}_{agent.name}.jsonl" + EXTENSIONS[compression])
+            entries = read_jsonl_log(path)
+            assert agent.transcript is None
+            assert entries[0]["role"] == "system" and entries[0]["content"] == "Survive."
+            assert sum(entry["role"] == "assistant" for entry in entries) == len(agent.parsed_response_history)
+
+
+def check_response_cache() -> None:
+    """
+    Check that the usage tracked by a `ResponseCache` matches its files when
+    responses are written over cached ones.
+    """
+    from src.agents.llm import ResponseCache
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(directory, max_entries=10)
+        for i in range(5):
+            cache.put(f"{i:064x}", "response")
+        for i in range(20):
+            cache.put(f"{0:064x}", "response" * (i % 3 + 1))
+        paths = glob.glob(os.path.join(directory, "*", "*.json"))
+        assert cache._ResponseCache__usage == (len(paths), sum(os.path.getsize(path) for path in paths)), cache._ResponseCache__usage
+
+
+def check_dataset() -> None:
+    """
+    Check that a dataset of logs with different columns fills the columns
+    missing from some logs with None, and refuses unknown columns.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        for seed in range(2):
+            result = api([RandomAgent(str(i)) for i in range(6)], save_tsv=True, return_summary=True, seed=seed)
+            shutil.copy(os.path.join("logs", f"log_{result['summary']['id']}.tsv"), os.path.join(directory, f"log_{seed}.tsv"))
+
+        # Drop a column from the first log, as if it were an older one
+        with open(os.path.join(directory, "log_0.tsv"), "r", encoding="utf8") as f:
+            rows = [line.rstrip("\n").split("\t") for line in f]
+        dropped = rows[0].index("character_state_stats_kills")
+        with open(os.path.join(directory, "log_0.tsv"), "w", encoding="utf8") as f:
+            f.writelines("\t".join(row[:dropped] + row[dropped + 1:]) + "\n" for row in rows)
+
+        dataset = LogDataset(directory)
+        df = dataset.load(columns=["game_id", "character_state_stats_kills"])
+        assert len(df) == len(dataset)
+        assert df["character_state_stats_kills"].isna().sum() == dataset.metas[0]["rows"]
+        try:
+            dataset.load(columns=["nonexistent"])
+            raise AssertionError("An unknown column was loaded")
+        except KeyError:
+            pass
+
+
+def check_shared_state(seed: int = 0) -> None:
+    """
+    Check that the states read from shared memory match the states of a game,
+    and that a reader never returns a state while it is being written.
+    """
+    random.seed(seed)
+    agents = [RandomAgent(str(i)) for i in range(12)]
+    game_ = Game(character_names=[agent.name for agent in agents], headless=True)
+    game_.start_game()
+    with SharedStateWriter([agent.name for agent in agents]) as writer:
+        reader = SharedStateReader(writer.name, [agent.name for agent in agents], game_.id)
+        while True:
+            state = game_.get_state_of_game()
+            notification = writer.publish(state)
+            assert notification["sequence"] == reader.sequence and reader.sequence % 2 == 0
+            for agent in agents:
+                shared_state = reader.get_state(agent.name)
+                assert shared_state["game"]["id"] == state["game"]["id"]
+                assert shared_state["game"]["state"] == state["game"]["state"]
+                character_state = state["characters"][agent.name]["state"]
+                assert shared_state["characters"][agent.name]["state"] == {field: character_state[field] for field in CHARACTER_FIELDS}
+            alive_agents = [agent for agent in agents if state["characters"][agent.name]["state"]["alive"]]
+            if len(alive_agents) <= 1:
+                break
+            for agent in alive_agents:
+                agent.give_state_of_game(state)
+                game_.set_action(agent.name, agent.interrogate())
+            game_.update_game()
+
+        # A state being written (odd sequence number) is never read
+        writer.header[0] += 1
+        try:
+            reader.snapshot(timeout=0.01)
+            raise AssertionError("A state being written was read")
+        except TimeoutError:
+            pass
+        writer.header[0] += 1
+        reader.close()
 
 
 if __name__ == '__main__':
@@ -14,3 +382,29 @@ if __name__ == '__main__':
     agents = [RandomAgent(name=str(i)) for i in range(24)]
 
     api(agents=agents, save_txt=True, save_tsv=True)
+
+    check_vectorized()
+
+    check_batched_decisions()
+
+    check_bootstrap()
+
+    check_sweep_intervals()
+
+    check_tournament_intervals()
+
+    check_store_seed()
+
+    check_latency_report()
+
+    check_decision_timeout()
+
+    check_log_closed_on_error()
+
+    check_transcripts()
+
+    check_response_cache()
+
+    check_dataset()
+
+    check_shared_state()